@@ -10,7 +10,7 @@ __author__ = "Mimetics Metrics Team"
 
 from .io import load_interactions, validate_data
 from .windows import create_windows, WindowProcessor
-from .graphs import build_graph, build_undirected_projection
+from .graphs import build_graph, build_graphs, build_undirected_projection, build_undirected_projection_sparse
 from .metrics_core import calculate_all_metrics
 from .community import detect_communities, calculate_nmi
 from .burst import detect_burst, find_onset_climax
@@ -23,7 +23,9 @@ __all__ = [
     "create_windows",
     "WindowProcessor",
     "build_graph",
+    "build_graphs",
     "build_undirected_projection",
+    "build_undirected_projection_sparse",
     "calculate_all_metrics",
     "detect_communities",
     "calculate_nmi",
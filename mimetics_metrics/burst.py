@@ -35,6 +35,11 @@ def detect_burst(
     if len(values) == 0:
         return []
     
+    # A flat series has no burst relative to its own distribution (the
+    # threshold would equal every value)
+    if threshold_method != "fixed" and np.min(values) == np.max(values):
+        return []
+    
     # Calculate threshold
     if threshold_method == "percentile":
         threshold = np.percentile(values, threshold_value)
@@ -158,6 +163,27 @@ def calculate_burst_metrics(
             'burst_duration': 0
         }
     
+    # Flat series: the statistics and onset/climax follow directly from the
+    # single value, without quantiles or a climax search ("smoothed" climax
+    # depends on rolling edge effects, so it takes the general path)
+    if climax_method != "smoothed" and pd.api.types.is_numeric_dtype(values):
+        arr = values.to_numpy(dtype=np.float64)
+        level = arr[0]
+        if arr.min() == level == arr.max():
+            on_level = bool(level >= onset_threshold)
+            first = values.index[0] if on_level else None
+            return {
+                'peak_mean': level,
+                'peak_median': level,
+                'peak_std': np.float64(0.0 if len(arr) > 1 else np.nan),
+                'onset_flag': on_level,
+                'climax_flag': on_level,
+                'onset_index': first,
+                'climax_index': first,
+                'burst_intensity': np.float64(1.0) if level > 0 else level,
+                'burst_duration': int(on_level)
+            }
+    
     # Basic statistics
     peak_mean = values.mean()
     peak_median = values.median()
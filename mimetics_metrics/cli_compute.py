@@ -14,7 +14,7 @@ from typing import Optional, List, Dict, Any
 from .io import load_interactions, get_window_metadata
 from .windows import create_windows, WindowProcessor
 from .graphs import build_graph, build_undirected_projection
-from .metrics_core import calculate_all_metrics, calculate_betweenness_centrality
+from .metrics_core import calculate_all_metrics, calculate_betweenness_centrality, scores_to_dict
 from .community import detect_communities_with_metrics, calculate_nmi
 from .burst import calculate_burst_metrics, find_onset_climax
 from .dose_response import analyze_dose_response, create_dose_response_report, calculate_dose_response_summary
@@ -275,7 +275,7 @@ Examples:
                     # Save node rankings if requested
                     if args.save_ranks:
                         # Calculate PageRank and betweenness
-                        pr_scores = metrics.get('pagerank_scores', {})
+                        pr_scores = scores_to_dict(metrics['pagerank_scores']) if 'pagerank_scores' in metrics else {}
                         bc_scores = calculate_betweenness_centrality(G, k=args.approx_betweenness)
                         
                         ranks_df = pd.DataFrame({
@@ -297,6 +297,12 @@ Examples:
         # Convert to DataFrame
         metrics_df = pd.DataFrame(all_metrics)
         
+        # PageRank scores are written as dictionaries, as before
+        if 'pagerank_scores' in metrics_df.columns:
+            metrics_df['pagerank_scores'] = metrics_df['pagerank_scores'].map(
+                lambda scores: scores_to_dict(scores) if isinstance(scores, tuple) else scores
+            )
+        
         # Calculate NMI with next window
         for i in range(len(metrics_df) - 1):
             if f"window_{i}" in all_communities and f"window_{i+1}" in all_communities:
@@ -20,7 +20,9 @@ from .plots import (
     create_dose_response_friendly_plot,
     create_residual_panel_plot,
     create_all_plots,
-    create_summary_plot
+    create_summary_plot,
+    _lazy_mpl,
+    _time_axis
 )
 
 logger = logging.getLogger(__name__)
@@ -173,9 +175,11 @@ Examples:
         
         logger.info(f"Loaded {len(metrics_df)} metric records")
         
-        # Set matplotlib style
-        import matplotlib.pyplot as plt
-        plt.style.use(args.style)
+        # Set matplotlib style (after the plot module's defaults are loaded,
+        # so the chosen style is applied on top of them)
+        _lazy_mpl()
+        import matplotlib
+        matplotlib.style.use(args.style)
         
         # Determine which plots to create
         plots_to_create = []
@@ -210,24 +214,28 @@ Examples:
         # Create plots
         figsize = tuple(args.figsize)
         
+        # Window start times as one datetime64 array, shared by the
+        # time-series plots
+        x = _time_axis(metrics_df)
+        
         for plot_type in plots_to_create:
             logger.info(f"Creating {plot_type} plot...")
             
             if plot_type == 'burst':
                 output_path = os.path.join(args.outdir, f'burst_series.{args.format}')
-                create_burst_series_plot(metrics_df, output_path, figsize)
+                create_burst_series_plot(metrics_df, output_path, figsize, x=x)
                 
             elif plot_type == 'topk_centralization':
                 output_path = os.path.join(args.outdir, f'topk_centralization.{args.format}')
-                create_topk_centralization_plot(metrics_df, output_path, figsize)
+                create_topk_centralization_plot(metrics_df, output_path, figsize, x=x)
                 
             elif plot_type == 'nmi':
                 output_path = os.path.join(args.outdir, f'nmi_series.{args.format}')
-                create_nmi_series_plot(metrics_df, output_path, figsize)
+                create_nmi_series_plot(metrics_df, output_path, figsize, x=x)
                 
             elif plot_type == 'isolation':
                 output_path = os.path.join(args.outdir, f'isolation_victim.{args.format}')
-                create_isolation_victim_plot(metrics_df, output_path, figsize)
+                create_isolation_victim_plot(metrics_df, output_path, figsize, x=x)
                 
             elif plot_type == 'dose_skeptics':
                 if not args.skeptic_col:
@@ -249,11 +257,11 @@ Examples:
                 
             elif plot_type == 'residual':
                 output_path = os.path.join(args.outdir, f'residual_panel.{args.format}')
-                create_residual_panel_plot(metrics_df, output_path, figsize)
+                create_residual_panel_plot(metrics_df, output_path, figsize, x=x)
                 
             elif plot_type == 'summary':
                 output_path = os.path.join(args.outdir, f'summary.{args.format}')
-                create_summary_plot(metrics_df, output_path, figsize)
+                create_summary_plot(metrics_df, output_path, figsize, x=x)
             
             logger.info(f"Plot saved to {output_path}")
         
@@ -5,11 +5,16 @@ Graph construction utilities for temporal network analysis.
 import networkx as nx
 import pandas as pd
 import numpy as np
+import scipy.sparse as sp
+from scipy.sparse.csgraph import connected_components, shortest_path
 from typing import Dict, Any, Optional, Tuple, List
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Interaction count above which build_graph aggregates edges in a sparse matrix
+SPARSE_BUILD_THRESHOLD = 1_000_000
+
 
 def build_graph(
     interactions_df: pd.DataFrame,
@@ -32,6 +37,13 @@ def build_graph(
     if len(interactions_df) == 0:
         return nx.DiGraph() if directed else nx.Graph()
     
+    if len(interactions_df) > SPARSE_BUILD_THRESHOLD:
+        return _build_graph_sparse(
+            interactions_df[src_col].to_numpy(),
+            interactions_df[dst_col].to_numpy(),
+            directed
+        )
+    
     # Create graph
     if directed:
         G = nx.DiGraph()
@@ -54,6 +66,52 @@ def build_graph(
     return G
 
 
+def _build_graph_sparse(
+    src: np.ndarray,
+    dst: np.ndarray,
+    directed: bool = True
+) -> nx.Graph:
+    """
+    Build a weighted graph by summing duplicate interactions in a COO matrix.
+    
+    Args:
+        src: Source node array
+        dst: Destination node array
+        directed: Whether to create directed graph
+        
+    Returns:
+        NetworkX graph with the same edges and weights as build_graph
+    """
+    n = len(src)
+    codes, nodes = pd.factorize(np.concatenate([src, dst]))
+    
+    row = np.empty(n, dtype=np.int32)
+    col = np.empty(n, dtype=np.int32)
+    row[:] = codes[:n]
+    col[:] = codes[n:]
+    
+    # Skip self-loops
+    keep = row != col
+    row, col = row[keep], col[keep]
+    
+    if not directed:
+        row, col = np.minimum(row, col), np.maximum(row, col)
+    
+    data = np.ones(len(row), dtype=np.int32)
+    A = sp.coo_matrix((data, (row, col)), shape=(len(nodes), len(nodes)))
+    A.sum_duplicates()
+    
+    G = nx.DiGraph() if directed else nx.Graph()
+    # Only nodes that take part in a non-self-loop edge, as in build_graph
+    G.add_nodes_from(nodes[np.unique(np.concatenate([A.row, A.col]))])
+    G.add_weighted_edges_from(
+        zip(nodes[A.row].tolist(), nodes[A.col].tolist(), A.data.tolist())
+    )
+    
+    logger.info(f"Built {'directed' if directed else 'undirected'} graph: {G.number_of_nodes()} nodes, {G.number_of_edges()} edges")
+    return G
+
+
 def build_undirected_projection(directed_graph: nx.DiGraph) -> nx.Graph:
     """
     Build undirected projection of a directed graph.
@@ -67,6 +125,92 @@ def build_undirected_projection(directed_graph: nx.DiGraph) -> nx.Graph:
     return directed_graph.to_undirected()
 
 
+def build_undirected_projection_sparse(G: nx.Graph) -> sp.csr_array:
+    """
+    Build the symmetrized adjacency matrix ``A + A.T`` of a graph.
+    
+    Args:
+        G: NetworkX graph (directed or undirected)
+        
+    Returns:
+        Binary symmetric CSR matrix with rows ordered as ``list(G)``
+    """
+    A = nx.to_scipy_sparse_array(G, weight=None, format='csr')
+    A_sym = (A + A.T).tocsr()
+    A_sym.data[:] = 1
+    return A_sym
+
+
+def _undirected_csr(G: nx.Graph) -> Tuple[sp.csr_array, List[Any]]:
+    """
+    Build the symmetrized adjacency of a graph from its current edges.
+    
+    Args:
+        G: Undirected NetworkX graph
+        
+    Returns:
+        Tuple of (CSR matrix, node list matching its rows)
+    """
+    return build_undirected_projection_sparse(G), list(G)
+
+
+def build_graphs(
+    interactions_df: pd.DataFrame,
+    src_col: str = "src",
+    dst_col: str = "dst"
+) -> Tuple[nx.DiGraph, nx.Graph]:
+    """
+    Build the directed graph and its undirected projection in one pass.
+    
+    Endpoints are factorized once and both graphs are filled from the same
+    integer edge arrays, giving the same nodes, edges, weights and insertion
+    order as ``build_graph`` followed by ``build_undirected_projection``.
+    
+    Args:
+        interactions_df: DataFrame with interactions
+        src_col: Source column name
+        dst_col: Destination column name
+        
+    Returns:
+        Tuple of (directed graph, undirected projection)
+    """
+    if len(interactions_df) == 0:
+        return nx.DiGraph(), nx.Graph()
+    
+    src = interactions_df[src_col].to_numpy()
+    dst = interactions_df[dst_col].to_numpy()
+    
+    # Skip self-loops
+    keep = src != dst
+    src, dst = src[keep], dst[keep]
+    
+    # Interleave endpoints so node codes follow first appearance row by row
+    codes, nodes = pd.factorize(np.column_stack([src, dst]).ravel())
+    n = len(nodes)
+    row, col = codes[0::2], codes[1::2]
+    
+    # Unique edges in first-appearance order, weighted by interaction count
+    edge_codes, first_edges = pd.factorize(row.astype(np.int64) * n + col)
+    weights = np.bincount(edge_codes, minlength=len(first_edges))
+    e_row, e_col = np.divmod(first_edges, n)
+    
+    node_list = nodes.tolist()
+    edges = list(zip(nodes[e_row].tolist(), nodes[e_col].tolist(), weights.tolist()))
+    
+    G_directed = nx.DiGraph()
+    G_directed.add_nodes_from(node_list)
+    G_directed.add_weighted_edges_from(edges)
+    
+    # to_undirected walks the adjacency source by source, later edges winning
+    G_undirected = nx.Graph()
+    G_undirected.add_nodes_from(node_list)
+    order = np.argsort(e_row, kind='stable')
+    G_undirected.add_weighted_edges_from(edges[i] for i in order.tolist())
+    
+    logger.info(f"Built directed graph: {n} nodes, {len(edges)} edges")
+    return G_directed, G_undirected
+
+
 def get_graph_metadata(G: nx.Graph) -> Dict[str, Any]:
     """
     Get basic metadata for a graph.
@@ -90,16 +234,21 @@ def get_graph_metadata(G: nx.Graph) -> Dict[str, Any]:
             max_edges = n_nodes * (n_nodes - 1) / 2
         density = n_edges / max_edges if max_edges > 0 else 0.0
     
-    # Check connectivity
+    if n_nodes == 0:
+        raise nx.NetworkXPointlessConcept("Connectivity is undefined for the null graph.")
+    
+    # Check connectivity: one component labelling per kind, "connected" is n_comp == 1
     if G.is_directed():
-        is_weakly_connected = nx.is_weakly_connected(G)
-        is_strongly_connected = nx.is_strongly_connected(G)
-        n_weakly_components = nx.number_weakly_connected_components(G)
-        n_strongly_components = nx.number_strongly_connected_components(G)
+        A = nx.to_scipy_sparse_array(G, weight=None, format='csr')
+        n_weakly_components = int(connected_components(A, directed=True, connection='weak')[0])
+        n_strongly_components = int(connected_components(A, directed=True, connection='strong')[0])
+        is_weakly_connected = n_weakly_components == 1
+        is_strongly_connected = n_strongly_components == 1
     else:
-        is_weakly_connected = nx.is_connected(G)
+        A, _ = _undirected_csr(G)
+        n_weakly_components = int(connected_components(A, directed=False)[0])
+        is_weakly_connected = n_weakly_components == 1
         is_strongly_connected = None
-        n_weakly_components = nx.number_connected_components(G)
         n_strongly_components = None
     
     return {
@@ -200,6 +349,10 @@ def get_strongly_connected_component_size(G: nx.DiGraph, node: str) -> int:
     """
     Get size of strongly connected component containing a node.
     
+    The SCC of a node is the set reachable from it that can also reach it,
+    so on a graph it is the intersection of a forward and a reverse BFS
+    from the node; the rest of the graph is never visited.
+    
     Args:
         G: Directed NetworkX graph
         node: Node ID
@@ -210,12 +363,34 @@ def get_strongly_connected_component_size(G: nx.DiGraph, node: str) -> int:
     if not G.has_node(node):
         return 0
     
-    sccs = list(nx.strongly_connected_components(G))
-    for scc in sccs:
-        if node in scc:
-            return len(scc)
+    forward = _reachable(G._adj, node)
+    backward = _reachable(G._pred, node)
+    return len(forward & backward)
+
+
+def _reachable(adj: Dict[Any, Dict[Any, Any]], source: Any) -> set:
+    """
+    Collect the nodes reachable from source by BFS over an adjacency dict.
     
-    return 1  # Node is in its own SCC
+    Args:
+        adj: NetworkX adjacency mapping (G._adj for successors, G._pred for
+            predecessors)
+        source: Start node
+        
+    Returns:
+        Set of reachable nodes, including source
+    """
+    seen = {source}
+    frontier = [source]
+    while frontier:
+        next_frontier = []
+        for v in frontier:
+            for w in adj[v]:
+                if w not in seen:
+                    seen.add(w)
+                    next_frontier.append(w)
+        frontier = next_frontier
+    return seen
 
 
 def calculate_reciprocity(G: nx.DiGraph, node: str) -> int:
@@ -232,9 +407,11 @@ def calculate_reciprocity(G: nx.DiGraph, node: str) -> int:
     if not G.has_node(node):
         return 0
     
+    # Raw adjacency dicts skip the view/method overhead per neighbour
+    adj = G._adj
     reciprocal_count = 0
-    for neighbor in G.neighbors(node):
-        if G.has_edge(neighbor, node):
+    for neighbor in adj[node]:
+        if node in adj[neighbor]:
             reciprocal_count += 1
     
     return reciprocal_count
@@ -272,29 +449,89 @@ def get_shortest_paths_to_node(
         return {}
 
 
-def calculate_median_distance_to_node(G: nx.Graph, target_node: str) -> float:
+def calculate_median_distance_to_node(
+    G: nx.Graph,
+    target_node: str,
+    distances: Optional[Dict[int, Tuple[List[Any], np.ndarray]]] = None
+) -> float:
     """
     Calculate median distance to a target node.
     
+    Without precomputed distances this runs a single BFS from the target
+    (in an undirected graph, distances to the target equal distances from it).
+    
     Args:
         G: NetworkX graph
         target_node: Target node ID
+        distances: Precomputed output of get_component_distances(G)
         
     Returns:
         Median distance to target node
     """
-    distances = get_shortest_paths_to_node(G, target_node)
+    if distances is not None:
+        for nodes, dist in distances.values():
+            if target_node in nodes:
+                i = nodes.index(target_node)
+                other_distances = np.delete(dist[i], i)
+                break
+        else:
+            return np.nan
+    else:
+        if not G.has_node(target_node):
+            return np.nan
+        
+        paths = nx.single_source_shortest_path_length(G, target_node)
+        
+        # Remove the target node itself (distance 0)
+        other_distances = np.fromiter(
+            (d for node, d in paths.items() if node != target_node),
+            dtype=np.int64
+        )
     
-    if not distances:
+    if len(other_distances) == 0:
         return np.nan
     
-    # Remove the target node itself (distance 0)
-    other_distances = [d for node, d in distances.items() if node != target_node]
+    return np.median(other_distances)
+
+
+def get_component_distances(G: nx.Graph) -> Dict[int, Tuple[List[Any], np.ndarray]]:
+    """
+    Compute all-pairs hop distances once per connected component.
     
-    if not other_distances:
-        return np.nan
+    The result can be passed to calculate_effective_diameter,
+    calculate_median_distance_to_node and calculate_avg_path_length so the
+    three metrics share a single set of BFS sweeps.
     
-    return np.median(other_distances)
+    Args:
+        G: Undirected NetworkX graph
+        
+    Returns:
+        Dictionary mapping component id to (nodes, distance matrix), where
+        the matrix rows/columns follow the node list
+    """
+    if G.number_of_nodes() == 0:
+        return {}
+    
+    A, nodes = _undirected_csr(G)
+    n_comp, labels = connected_components(A, directed=False)
+    
+    # Group node indices by component with one sort instead of a scan per label
+    order = np.argsort(labels, kind='stable')
+    bounds = np.searchsorted(labels[order], np.arange(n_comp + 1))
+    
+    result = {}
+    for comp_id in range(n_comp):
+        idx = order[bounds[comp_id]:bounds[comp_id + 1]]
+        if len(idx) == 1:
+            # Isolated node: nothing to search
+            dist = np.zeros((1, 1), dtype=np.uint8)
+        else:
+            dist = shortest_path(A[idx][:, idx], directed=False, unweighted=True)
+            # Hop counts within a component never exceed its size - 1
+            dist = dist.astype(np.min_scalar_type(len(idx) - 1))
+        result[comp_id] = ([nodes[i] for i in idx], dist)
+    
+    return result
 
 
 def get_connected_components(G: nx.Graph) -> List[set]:
@@ -313,13 +550,18 @@ def get_connected_components(G: nx.Graph) -> List[set]:
         return list(nx.connected_components(G))
 
 
-def calculate_effective_diameter(G: nx.Graph, percentile: float = 0.9) -> float:
+def calculate_effective_diameter(
+    G: nx.Graph,
+    percentile: float = 0.9,
+    distances: Optional[Dict[int, Tuple[List[Any], np.ndarray]]] = None
+) -> float:
     """
     Calculate effective diameter of a graph.
     
     Args:
         G: NetworkX graph
         percentile: Percentile for effective diameter (default 0.9)
+        distances: Precomputed output of get_component_distances(G)
         
     Returns:
         Effective diameter
@@ -328,22 +570,34 @@ def calculate_effective_diameter(G: nx.Graph, percentile: float = 0.9) -> float:
         return 0.0
     
     try:
-        # Get all shortest path lengths
-        all_paths = dict(nx.all_pairs_shortest_path_length(G))
-        
-        # Collect all distances
-        distances = []
-        for source, targets in all_paths.items():
-            for target, distance in targets.items():
-                if source != target:  # Exclude self-distances
-                    distances.append(distance)
+        if distances is not None:
+            # Off-diagonal entries of every component matrix
+            distances = np.concatenate([
+                dist[~np.eye(len(nodes), dtype=bool)]
+                for nodes, dist in distances.values()
+            ])
+        else:
+            # Get all shortest path lengths
+            all_paths = nx.all_pairs_shortest_path_length(G)
+            
+            # Collect all distances (excluding self-distances) into a compact
+            # integer buffer; no distance can exceed n - 1
+            distances = np.fromiter(
+                (
+                    distance
+                    for source, targets in all_paths
+                    for target, distance in targets.items()
+                    if source != target
+                ),
+                dtype=np.min_scalar_type(G.number_of_nodes() - 1)
+            )
         
-        if not distances:
+        if len(distances) == 0:
             return 0.0
         
-        # Calculate effective diameter
-        distances = np.array(distances)
-        return np.percentile(distances, percentile * 100)
+        # Calculate effective diameter (lower percentile via partial sort)
+        k = int(percentile * (len(distances) - 1))
+        return float(np.partition(distances, k)[k])
         
     except nx.NetworkXError:
         return np.nan
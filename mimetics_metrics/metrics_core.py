@@ -5,28 +5,185 @@ Core metrics calculation for temporal network analysis.
 import networkx as nx
 import pandas as pd
 import numpy as np
-from typing import Dict, Any, Optional, List, Tuple
+import scipy.sparse as sp
+from typing import Dict, Any, Optional, List, Tuple, Union
 import logging
+import math
+from itertools import permutations
 from scipy import stats
 from sklearn.metrics import normalized_mutual_info_score
 
+try:
+    import networkit as nk
+    NETWORKIT_AVAILABLE = True
+except ImportError:
+    NETWORKIT_AVAILABLE = False
+
+try:
+    import igraph as ig
+    IGRAPH_AVAILABLE = True
+except ImportError:
+    IGRAPH_AVAILABLE = False
+
+try:
+    import nx_cugraph  # noqa: F401  (registers the "cugraph" NetworkX backend)
+    import cupy
+    CUGRAPH_AVAILABLE = cupy.cuda.runtime.getDeviceCount() > 0
+except Exception:
+    CUGRAPH_AVAILABLE = False
+
+try:
+    from numba import njit, get_num_threads
+    from ._bc_numba import brandes_csr
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    
+    def njit(*args, **kwargs):
+        """Fallback that leaves the function as plain Python."""
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
 from .graphs import (
-    build_graph, build_undirected_projection, get_graph_metadata,
+    build_graphs, get_graph_metadata,
     calculate_ego_density, get_strongly_connected_component_size,
     calculate_reciprocity, calculate_median_distance_to_node,
-    calculate_effective_diameter
+    calculate_effective_diameter, get_component_distances
 )
 
 logger = logging.getLogger(__name__)
 
+# Node count from which backend="auto" hands betweenness to a compiled library
+LARGE_GRAPH_THRESHOLD = 1000
+
+# Node count above which backend="auto" uses igraph's C kernels for exact
+# betweenness and PageRank when installed
+IGRAPH_GRAPH_THRESHOLD = 500
+
+# Node count above which backend="auto" dispatches to nx-cugraph on a GPU
+GPU_GRAPH_THRESHOLD = 50_000
+
+# Largest graph for which betweenness is exact by default; larger graphs
+# sample max(50, sqrt(N)) sources unless k is given
+EXACT_BETWEENNESS_MAX_NODES = 200
 
-def calculate_pagerank(G: nx.DiGraph, alpha: float = 0.85) -> Dict[str, float]:
+def _resolve_gpu_backend(G: nx.Graph, backend: str) -> bool:
+    """Whether an algorithm on G should be dispatched to nx-cugraph."""
+    if backend == "cugraph":
+        if CUGRAPH_AVAILABLE:
+            return True
+        logger.warning("nx-cugraph or a CUDA device not available, falling back to CPU")
+        return False
+    return backend == "auto" and CUGRAPH_AVAILABLE and G.number_of_nodes() > GPU_GRAPH_THRESHOLD
+
+
+def _use_igraph(G: nx.Graph, backend: str) -> bool:
+    """Whether an algorithm on G should run on igraph."""
+    if backend == "igraph":
+        if IGRAPH_AVAILABLE:
+            return True
+        logger.warning("igraph not available, falling back to NetworkX")
+        return False
+    return backend == "auto" and IGRAPH_AVAILABLE and G.number_of_nodes() > IGRAPH_GRAPH_THRESHOLD
+
+
+def _to_igraph(G: nx.Graph, weight: Optional[str] = None) -> Tuple["ig.Graph", List[Any]]:
+    """
+    Convert a NetworkX graph to igraph, keeping isolated nodes.
+    
+    Args:
+        G: NetworkX graph
+        weight: Edge attribute stored as the igraph "weight" attribute
+        
+    Returns:
+        Tuple of (igraph graph, node list in igraph vertex order)
+    """
+    nodes = list(G)
+    A = nx.to_scipy_sparse_array(G, nodelist=nodes, weight=weight, dtype=float, format='coo')
+    
+    g = ig.Graph(n=len(nodes), edges=np.column_stack([A.row, A.col]).tolist(), directed=G.is_directed())
+    if weight is not None:
+        g.es['weight'] = A.data.tolist()
+    return g, nodes
+
+
+def _pagerank_igraph(G: nx.DiGraph, alpha: float = 0.85) -> Dict[str, float]:
+    """
+    PageRank computed by igraph (PRPACK).
+    
+    Args:
+        G: Directed NetworkX graph
+        alpha: Damping parameter
+        
+    Returns:
+        Dictionary mapping node_id to PageRank score
+    """
+    g, nodes = _to_igraph(G, weight='weight')
+    scores = g.pagerank(directed=G.is_directed(), damping=alpha, weights='weight')
+    return dict(zip(nodes, scores))
+
+
+def _pagerank_csr(
+    G: nx.DiGraph,
+    alpha: float = 0.85,
+    max_iter: int = 100,
+    tol: float = 1.0e-6
+) -> Dict[str, float]:
+    """
+    PageRank by power iteration on a sparse transition matrix.
+    
+    Follows the same weighting, dangling-node and convergence rules as
+    nx.pagerank, but every iteration is a single CSR mat-vec product.
+    
+    Args:
+        G: Directed NetworkX graph
+        alpha: Damping parameter
+        max_iter: Maximum number of iterations
+        tol: Error tolerance used to check convergence
+        
+    Returns:
+        Dictionary mapping node_id to PageRank score
+    """
+    nodes = list(G)
+    n = len(nodes)
+    
+    A = nx.to_scipy_sparse_array(G, nodelist=nodes, weight='weight', dtype=float, format='csr')
+    
+    # Row-normalize into a transition matrix
+    out_weight = np.asarray(A.sum(axis=1)).ravel()
+    is_dangling = out_weight == 0
+    inv_out = np.zeros(n)
+    inv_out[~is_dangling] = 1.0 / out_weight[~is_dangling]
+    # Scale each row's entries in place (sp.diags_array needs SciPy >= 1.11)
+    A.data *= np.repeat(inv_out, np.diff(A.indptr))
+    M = A.T.tocsr()
+    
+    r = np.full(n, 1.0 / n)
+    teleport = (1 - alpha) / n
+    for _ in range(max_iter):
+        r_last = r
+        r = alpha * (M @ r_last + r_last[is_dangling].sum() / n) + teleport
+        if np.abs(r - r_last).sum() < n * tol:
+            return dict(zip(nodes, r.tolist()))
+    
+    raise nx.PowerIterationFailedConvergence(max_iter)
+
+
+def calculate_pagerank(
+    G: nx.DiGraph,
+    alpha: float = 0.85,
+    backend: str = "auto"
+) -> Dict[str, float]:
     """
     Calculate PageRank for all nodes in a directed graph.
     
     Args:
         G: Directed NetworkX graph
         alpha: Damping parameter
+        backend: "cpu", "igraph", "cugraph", or "auto" (cugraph for very
+            large graphs when a GPU is present, else igraph above
+            IGRAPH_GRAPH_THRESHOLD nodes when installed)
         
     Returns:
         Dictionary mapping node_id to PageRank score
@@ -34,18 +191,175 @@ def calculate_pagerank(G: nx.DiGraph, alpha: float = 0.85) -> Dict[str, float]:
     if G.number_of_nodes() == 0:
         return {}
     
+    if G.number_of_nodes() == 1:
+        return {node: 1.0 for node in G.nodes()}
+    
     try:
-        pr = nx.pagerank(G, alpha=alpha)
-        return pr
+        if _resolve_gpu_backend(G, backend):
+            return dict(nx.pagerank(G, alpha=alpha, backend="cugraph"))
+        if _use_igraph(G, backend):
+            return _pagerank_igraph(G, alpha=alpha)
+        return _pagerank_csr(G, alpha=alpha)
     except nx.PowerIterationFailedConvergence:
         logger.warning("PageRank failed to converge, using default values")
         return {node: 1.0 / G.number_of_nodes() for node in G.nodes()}
 
 
+def _betweenness_networkit(
+    G: nx.Graph,
+    normalized: bool = True,
+    k: Optional[int] = None,
+    seed: Optional[int] = None
+) -> Dict[str, float]:
+    """
+    Betweenness centrality computed by networkit's C++/OpenMP kernels.
+    
+    Args:
+        G: NetworkX graph
+        normalized: Whether to normalize centrality scores
+        k: Number of source samples for approximation (if None, exact)
+        seed: Random seed for the source sample. EstimateBetweenness takes
+            no seed of its own, so this sets networkit's process-wide seed
+            (nk.setSeed); None leaves it untouched
+        
+    Returns:
+        Dictionary mapping node_id to betweenness centrality
+    """
+    nkG = nk.nxadapter.nx2nk(G)
+    
+    if k:
+        if seed is not None:
+            nk.setSeed(seed, False)
+        bc = nk.centrality.EstimateBetweenness(nkG, k, normalized, True)
+    else:
+        bc = nk.centrality.Betweenness(nkG, normalized=normalized)
+    bc.run()
+    
+    scores = np.asarray(bc.scores())
+    if not normalized and not G.is_directed():
+        # networkit counts each undirected pair in both directions
+        scores = scores / 2
+    
+    # nx2nk numbers nodes in G.nodes() order
+    return dict(zip(G.nodes(), scores.tolist()))
+
+
+def _betweenness_igraph(G: nx.Graph, normalized: bool = True) -> Dict[str, float]:
+    """
+    Exact betweenness centrality computed by igraph's C implementation.
+    
+    Args:
+        G: NetworkX graph
+        normalized: Whether to normalize centrality scores
+        
+    Returns:
+        Dictionary mapping node_id to betweenness centrality
+    """
+    g, nodes = _to_igraph(G)
+    # igraph counts ordered pairs on directed graphs and unordered pairs on
+    # undirected ones, matching the unnormalized NetworkX scores
+    scores = np.asarray(g.betweenness(directed=G.is_directed(), cutoff=None), dtype=float)
+    
+    n = len(nodes)
+    if normalized and n > 2:
+        correction = 1 if G.is_directed() else 2
+        scores *= correction / ((n - 1) * (n - 2))
+    return dict(zip(nodes, scores.tolist()))
+
+
+def _betweenness_numba(
+    G: nx.Graph,
+    normalized: bool = True,
+    k: Optional[int] = None,
+    seed: Optional[int] = None
+) -> Dict[str, float]:
+    """
+    Betweenness centrality by the Numba-compiled CSR Brandes kernel.
+    
+    Scores are rescaled exactly as nx.betweenness_centrality does, including
+    the separate source/non-source factors used when sampling k sources.
+    
+    Args:
+        G: NetworkX graph
+        normalized: Whether to normalize centrality scores
+        k: Number of source samples for approximation (if None, exact)
+        seed: Random seed for the source sample
+        
+    Returns:
+        Dictionary mapping node_id to betweenness centrality
+    """
+    nodes = list(G)
+    n = len(nodes)
+    A = nx.to_scipy_sparse_array(G, nodelist=nodes, weight=None, format='csr')
+    
+    if k:
+        sources = np.sort(np.random.default_rng(seed).choice(n, size=k, replace=False))
+    else:
+        sources = np.arange(n)
+    
+    raw = brandes_csr(
+        A.indptr.astype(np.int64), A.indices.astype(np.int64),
+        sources.astype(np.int64), max(1, min(get_num_threads(), len(sources)))
+    )
+    
+    N = n - 1
+    if N < 2:
+        return dict(zip(nodes, raw.tolist()))
+    
+    correction = 1 if G.is_directed() else 2
+    if not k:
+        scale = 1 / (N * (N - 1)) if normalized else 1 / correction
+        return dict(zip(nodes, (raw * scale).tolist()))
+    
+    if normalized:
+        scale_source = 1 / ((k - 1) * (N - 1)) if k > 1 else np.nan
+        scale_nonsource = 1 / (k * (N - 1))
+    else:
+        scale_source = N / ((k - 1) * correction) if k > 1 else np.nan
+        scale_nonsource = N / (k * correction)
+    scale = np.full(n, scale_nonsource)
+    scale[sources] = scale_source
+    return dict(zip(nodes, (raw * scale).tolist()))
+
+
+def _betweenness_small(G: nx.Graph, normalized: bool = True) -> Dict[str, float]:
+    """
+    Closed-form betweenness centrality for graphs with at most three nodes.
+    
+    With three nodes the only possible intermediate of an s-t path is the
+    third node, which is on the (unique) shortest path exactly when s->v->t
+    exists and s->t does not.
+    
+    Args:
+        G: NetworkX graph with at most three nodes
+        normalized: Whether to normalize centrality scores
+        
+    Returns:
+        Dictionary mapping node_id to betweenness centrality
+    """
+    nodes = list(G)
+    if len(nodes) < 3:
+        return {node: 0.0 for node in nodes}
+    
+    raw = {
+        v: sum(
+            1.0 for s, t in permutations([u for u in nodes if u != v], 2)
+            if G.has_edge(s, v) and G.has_edge(v, t) and not G.has_edge(s, t)
+        )
+        for v in nodes
+    }
+    
+    # Undirected pairs were counted in both directions; n=3 normalizes by 2
+    scale = 0.5 if (normalized or not G.is_directed()) else 1.0
+    return {node: score * scale for node, score in raw.items()}
+
+
 def calculate_betweenness_centrality(
     G: nx.Graph, 
     normalized: bool = True,
-    k: Optional[int] = None
+    k: Optional[int] = None,
+    backend: str = "auto",
+    seed: Optional[int] = 42
 ) -> Dict[str, float]:
     """
     Calculate betweenness centrality for all nodes.
@@ -53,7 +367,17 @@ def calculate_betweenness_centrality(
     Args:
         G: NetworkX graph
         normalized: Whether to normalize centrality scores
-        k: Number of nodes to sample for approximation (if None, use all nodes)
+        k: Number of nodes to sample for approximation (if None, exact up
+            to EXACT_BETWEENNESS_MAX_NODES nodes and max(50, sqrt(N)) samples
+            above; 0 forces the exact computation)
+        backend: "networkx", "igraph", "networkit", "numba", "cugraph", or
+            "auto" (cugraph for very large graphs on a GPU, else igraph for
+            exact scores above IGRAPH_GRAPH_THRESHOLD nodes, else networkit
+            or numba for large graphs when installed). igraph only computes
+            exact scores; sampled runs use the other backends, and "auto"
+            keeps seeded samples off networkit.
+        seed: Random seed for the source sample (None for a fresh sample).
+            With backend="networkit" this sets networkit's global seed.
         
     Returns:
         Dictionary mapping node_id to betweenness centrality
@@ -61,10 +385,60 @@ def calculate_betweenness_centrality(
     if G.number_of_nodes() == 0:
         return {}
     
+    if G.number_of_nodes() <= 3:
+        return _betweenness_small(G, normalized=normalized)
+    
+    n = G.number_of_nodes()
+    if k is None and n > EXACT_BETWEENNESS_MAX_NODES:
+        k = max(50, int(math.sqrt(n)))
+    
+    if not k or k >= n:
+        k = None
+    
+    return _betweenness_dispatch(G, normalized, k, backend, seed)
+
+
+def _betweenness_dispatch(
+    G: nx.Graph,
+    normalized: bool,
+    k: Optional[int],
+    backend: str,
+    seed: Optional[int]
+) -> Dict[str, float]:
+    """Run betweenness centrality on the backend selected by backend."""
+    if _resolve_gpu_backend(G, backend):
+        return dict(nx.betweenness_centrality(G, k=k, normalized=normalized, seed=seed, backend="cugraph"))
+    
+    if not k and _use_igraph(G, backend):
+        return _betweenness_igraph(G, normalized=normalized)
+    
+    if backend == "igraph":
+        backend = "auto"
+    
+    if backend == "auto":
+        backend = "networkx"
+        if G.number_of_nodes() >= LARGE_GRAPH_THRESHOLD:
+            # A seeded sample on networkit would reseed its global RNG, so
+            # those runs go to the backends that seed a local generator
+            if NETWORKIT_AVAILABLE and not (k and seed is not None):
+                backend = "networkit"
+            elif NUMBA_AVAILABLE:
+                backend = "numba"
+    
+    if backend == "networkit":
+        if NETWORKIT_AVAILABLE:
+            return _betweenness_networkit(G, normalized=normalized, k=k, seed=seed)
+        logger.warning("networkit not available, falling back to NetworkX")
+    
+    if backend == "numba":
+        if NUMBA_AVAILABLE:
+            return _betweenness_numba(G, normalized=normalized, k=k, seed=seed)
+        logger.warning("numba not available, falling back to NetworkX")
+    
     try:
-        if k and k < G.number_of_nodes():
+        if k:
             # Use sampling for large graphs
-            bc = nx.betweenness_centrality(G, k=k, normalized=normalized)
+            bc = nx.betweenness_centrality(G, k=k, normalized=normalized, seed=seed)
         else:
             bc = nx.betweenness_centrality(G, normalized=normalized)
         return bc
@@ -73,12 +447,19 @@ def calculate_betweenness_centrality(
         return {node: 0.0 for node in G.nodes()}
 
 
-def calculate_betweenness_centralization(G: nx.Graph) -> float:
+def calculate_betweenness_centralization(
+    G: nx.Graph,
+    k: Optional[int] = None,
+    seed: Optional[int] = 42
+) -> float:
     """
     Calculate Freeman betweenness centralization for a graph.
     
     Args:
         G: NetworkX graph
+        k: Number of nodes to sample for betweenness (see
+            calculate_betweenness_centrality)
+        seed: Random seed for the source sample
         
     Returns:
         Betweenness centralization score
@@ -87,21 +468,34 @@ def calculate_betweenness_centralization(G: nx.Graph) -> float:
         return 0.0
     
     # Calculate betweenness centrality
-    bc = calculate_betweenness_centrality(G, normalized=False)
+    bc = calculate_betweenness_centrality(G, normalized=False, k=k, seed=seed)
+    
+    return _centralization_from_bc(bc, G.number_of_nodes(), G.is_directed())
+
+
+def _centralization_from_bc(bc: Dict[str, float], n: int, directed: bool) -> float:
+    """
+    Freeman centralization from unnormalized betweenness scores.
     
+    Args:
+        bc: Dictionary mapping node_id to unnormalized betweenness
+        n: Number of nodes in the graph
+        directed: Whether the scores come from a directed graph
+        
+    Returns:
+        Betweenness centralization score
+    """
     if not bc:
         return 0.0
     
-    # Find maximum betweenness
-    max_bc = max(bc.values())
-    
     # Calculate centralization
-    n = G.number_of_nodes()
     if n <= 2:
         return 0.0
     
+    values = np.fromiter(bc.values(), dtype=np.float64, count=len(bc))
+    
     # Theoretical maximum for directed graph
-    if G.is_directed():
+    if directed:
         max_theoretical = (n - 1) * (n - 2)
     else:
         max_theoretical = (n - 1) * (n - 2) / 2
@@ -110,34 +504,56 @@ def calculate_betweenness_centralization(G: nx.Graph) -> float:
         return 0.0
     
     # Sum of differences from maximum
-    sum_diff = sum(max_bc - bc_val for bc_val in bc.values())
+    sum_diff = (values.max() - values).sum()
     
-    return sum_diff / max_theoretical
+    return float(sum_diff / max_theoretical)
 
 
-def calculate_topk_share(scores: Dict[str, float], k: int) -> float:
+def calculate_topk_share(scores: Union[Dict[str, float], np.ndarray], k: int) -> float:
     """
     Calculate share of top-k nodes in total score.
     
     Args:
-        scores: Dictionary mapping node_id to score
+        scores: Dictionary mapping node_id to score, or array of scores
         k: Number of top nodes to consider
         
     Returns:
         Share of top-k nodes
     """
-    if not scores:
+    if len(scores) == 0:
         return 0.0
     
-    total_score = sum(scores.values())
+    if isinstance(scores, dict):
+        values = np.fromiter(scores.values(), dtype=np.float64, count=len(scores))
+    else:
+        values = np.asarray(scores, dtype=np.float64)
+    total_score = values.sum()
     if total_score == 0:
         return 0.0
     
-    # Get top-k nodes
-    sorted_nodes = sorted(scores.items(), key=lambda x: x[1], reverse=True)
-    topk_score = sum(score for _, score in sorted_nodes[:k])
+    k = min(k, len(values))
+    if k <= 0:
+        return 0.0
     
-    return topk_score / total_score
+    # Get top-k scores by partial sort
+    topk_score = np.partition(values, -k)[-k:].sum()
+    
+    return float(topk_score / total_score)
+
+
+def scores_to_dict(scores: Tuple[np.ndarray, np.ndarray]) -> Dict[str, float]:
+    """
+    Convert stored (node ids, scores) arrays back to a dictionary.
+    
+    Args:
+        scores: Tuple of node id array and score array, as stored in
+            metrics['pagerank_scores'] by calculate_all_metrics
+        
+    Returns:
+        Dictionary mapping node_id to score
+    """
+    nodes, values = scores
+    return dict(zip(nodes.tolist(), values.tolist()))
 
 
 def calculate_assortativity(G: nx.Graph, attribute: str) -> float:
@@ -167,12 +583,19 @@ def calculate_assortativity(G: nx.Graph, attribute: str) -> float:
         return np.nan
 
 
-def calculate_avg_path_length(G: nx.Graph) -> float:
+def calculate_avg_path_length(
+    G: nx.Graph,
+    distances: Optional[Dict[int, Tuple[List[Any], np.ndarray]]] = None
+) -> float:
     """
     Calculate average shortest path length.
     
+    For disconnected graphs this is the average over all connected pairs,
+    i.e. per-component averages weighted by their number of pairs.
+    
     Args:
         G: NetworkX graph
+        distances: Precomputed output of get_component_distances(G)
         
     Returns:
         Average shortest path length
@@ -180,30 +603,66 @@ def calculate_avg_path_length(G: nx.Graph) -> float:
     if G.number_of_nodes() < 2:
         return np.nan
     
-    try:
-        if nx.is_connected(G):
-            return nx.average_shortest_path_length(G)
-        else:
-            # For disconnected graphs, calculate for each component
-            components = list(nx.connected_components(G))
-            if len(components) == 1:
-                return nx.average_shortest_path_length(G)
-            else:
-                # Weighted average by component size
-                total_length = 0
-                total_pairs = 0
-                
-                for component in components:
-                    if len(component) > 1:
-                        subgraph = G.subgraph(component)
-                        comp_length = nx.average_shortest_path_length(subgraph)
-                        comp_pairs = len(component) * (len(component) - 1)
-                        total_length += comp_length * comp_pairs
-                        total_pairs += comp_pairs
-                
-                return total_length / total_pairs if total_pairs > 0 else np.nan
-    except nx.NetworkXError:
-        return np.nan
+    if distances is None:
+        distances = get_component_distances(G)
+    
+    total_length = 0
+    total_pairs = 0
+    
+    for nodes, dist in distances.values():
+        if len(nodes) > 1:
+            total_length += dist.sum(dtype=np.int64)
+            total_pairs += len(nodes) * (len(nodes) - 1)
+    
+    return total_length / total_pairs if total_pairs > 0 else np.nan
+
+
+def _victim_local_metrics(
+    G_directed: nx.DiGraph,
+    G_undirected: nx.Graph,
+    victim_id: str
+) -> Tuple[int, int, float]:
+    """
+    Reciprocity, SCC size and ego density of the victim in one pass.
+    
+    Equivalent to calculate_reciprocity, get_strongly_connected_component_size
+    and calculate_ego_density, but only the victim's neighbourhood and the
+    nodes it reaches (or that reach it) are traversed.
+    
+    Args:
+        G_directed: Directed NetworkX graph
+        G_undirected: Undirected projection of G_directed
+        victim_id: Victim node ID (must be in the graph)
+        
+    Returns:
+        Tuple of (reciprocity, scc_size, ego_density)
+    """
+    # Raw adjacency dicts skip the view/method overhead per neighbour
+    succ = G_directed._succ[victim_id]
+    pred = G_directed._pred[victim_id]
+    
+    # Reciprocity: neighbours linked in both directions
+    reciprocity = sum(1 for w in succ if w in pred)
+    
+    # SCC: without in- or out-edges the victim is its own component
+    if reciprocity == 0 and (not pred or not succ):
+        scc_size = 1
+    else:
+        # Forward and reverse BFS from the victim only
+        scc_size = get_strongly_connected_component_size(G_directed, victim_id)
+    
+    # Ego density: edges among the victim's neighbours
+    adj = G_undirected._adj
+    neighbors = set(adj[victim_id])
+    neighbors.discard(victim_id)
+    n = len(neighbors)
+    if n < 2:
+        ego_density = 0.0
+    else:
+        m = sum(len(neighbors.intersection(adj[u])) for u in neighbors) / 2
+        ego_density = m / (n * (n - 1) / 2)
+    
+    return reciprocity, scc_size, ego_density
 
 
 def calculate_all_metrics(
@@ -248,8 +707,7 @@ def calculate_all_metrics(
         return metrics
     
     # Build directed graph
-    G_directed = build_graph(interactions_df, directed=True)
-    G_undirected = build_undirected_projection(G_directed)
+    G_directed, G_undirected = build_graphs(interactions_df)
     
     # Basic graph metadata
     graph_metadata = get_graph_metadata(G_directed)
@@ -266,30 +724,41 @@ def calculate_all_metrics(
     # 4.2 Reorganization pro-leader metrics
     # PageRank
     pr_scores = calculate_pagerank(G_directed)
-    metrics['pagerank_scores'] = pr_scores
+    
+    pr_nodes = list(pr_scores)
+    pr_arr = np.fromiter(pr_scores.values(), dtype=np.float64, count=len(pr_scores))
+    
+    # Kept per window as (node ids, float32 scores); the window metrics
+    # below use the float64 values
+    metrics['pagerank_scores'] = (np.array(pr_nodes, dtype=object), pr_arr.astype(np.float32))
     
     # Top-K PageRank share
     for k in topk_values:
-        metrics[f'topk_pr_share_k{k}'] = calculate_topk_share(pr_scores, k)
+        metrics[f'topk_pr_share_k{k}'] = calculate_topk_share(pr_arr, k)
     
     # Leader metrics
     if leader_id and leader_id in G_directed.nodes():
         leader_pr = pr_scores.get(leader_id, 0.0)
         metrics['leader_pagerank'] = leader_pr
         
-        # Rank of leader
-        sorted_pr = sorted(pr_scores.items(), key=lambda x: x[1], reverse=True)
-        leader_rank = next(i for i, (node, _) in enumerate(sorted_pr) if node == leader_id) + 1
+        # Rank of leader: higher scores, plus ties listed before it (stable sort order)
+        leader_pos = pr_nodes.index(leader_id)
+        leader_rank = int((pr_arr > leader_pr).sum() + (pr_arr[:leader_pos] == leader_pr).sum()) + 1
         metrics['leader_rank'] = leader_rank
     else:
         # Infer leader as top-1 PageRank
         if pr_scores:
-            top_leader = max(pr_scores.items(), key=lambda x: x[1])
-            metrics['inferred_leader'] = top_leader[0]
-            metrics['inferred_leader_pr'] = top_leader[1]
+            top = int(pr_arr.argmax())
+            metrics['inferred_leader'] = pr_nodes[top]
+            metrics['inferred_leader_pr'] = pr_scores[pr_nodes[top]]
     
-    # Betweenness centralization
-    metrics['betweenness_centralization'] = calculate_betweenness_centralization(G_directed)
+    # Betweenness centralization (scores reused for the skeptic share below)
+    bc_scores = calculate_betweenness_centrality(
+        G_directed, normalized=False, k=approx_betweenness_k
+    )
+    metrics['betweenness_centralization'] = _centralization_from_bc(
+        bc_scores, G_directed.number_of_nodes(), directed=True
+    )
     
     # 4.3 Community change metrics
     # This will be handled by community detection module
@@ -297,14 +766,12 @@ def calculate_all_metrics(
     
     # 4.4 Victim isolation metrics
     if victim_id and victim_id in G_directed.nodes():
-        # Reciprocity
-        metrics['victim_reciprocity'] = calculate_reciprocity(G_directed, victim_id)
-        
-        # SCC size
-        metrics['victim_scc_size'] = get_strongly_connected_component_size(G_directed, victim_id)
-        
-        # Ego density
-        ego_density = calculate_ego_density(G_undirected, victim_id)
+        # Reciprocity, SCC size and ego density
+        reciprocity, scc_size, ego_density = _victim_local_metrics(
+            G_directed, G_undirected, victim_id
+        )
+        metrics['victim_reciprocity'] = reciprocity
+        metrics['victim_scc_size'] = scc_size
         metrics['victim_ego_density'] = ego_density
         
         # Time to isolation (will be calculated across windows)
@@ -330,8 +797,7 @@ def calculate_all_metrics(
         # Assortativity by skeptic label
         metrics['assort_skeptic'] = calculate_assortativity(G_undirected, 'skeptic')
         
-        # Betweenness share of skeptics
-        bc_scores = calculate_betweenness_centrality(G_undirected, k=approx_betweenness_k)
+        # Betweenness share of skeptics (a ratio, so normalization cancels)
         skeptic_bc = sum(
             bc_scores.get(node, 0) for node, labels in node_labels.items()
             if labels.get('skeptic', 0) == 1
@@ -345,7 +811,8 @@ def calculate_all_metrics(
     # Victim in-degree share
     if victim_id and victim_id in G_directed.nodes():
         victim_in_degree = G_directed.in_degree(victim_id)
-        total_in_degree = sum(G_directed.in_degree(node) for node in G_directed.nodes())
+        # Every directed edge contributes exactly one in-degree
+        total_in_degree = G_directed.number_of_edges()
         metrics['victim_inshare'] = victim_in_degree / total_in_degree if total_in_degree > 0 else 0.0
     else:
         metrics['victim_inshare'] = 0.0
@@ -354,16 +821,19 @@ def calculate_all_metrics(
     # Graph density (already calculated)
     metrics['graph_density'] = metrics['density']
     
+    # Distances per component, shared by the path-based metrics below
+    distances = get_component_distances(G_undirected)
+    
     # Average path length
-    metrics['avg_path_len'] = calculate_avg_path_length(G_undirected)
+    metrics['avg_path_len'] = calculate_avg_path_length(G_undirected, distances)
     
     # Effective diameter
-    metrics['eff_diameter'] = calculate_effective_diameter(G_undirected)
+    metrics['eff_diameter'] = calculate_effective_diameter(G_undirected, distances=distances)
     
     # 4.7 Symbolic emergence metrics (post-ritual)
     if victim_id and victim_id in G_undirected.nodes():
         # Median distance to victim
-        median_dist = calculate_median_distance_to_node(G_undirected, victim_id)
+        median_dist = calculate_median_distance_to_node(G_undirected, victim_id, distances)
         metrics['median_distance_to_victim'] = median_dist
     else:
         metrics['median_distance_to_victim'] = np.nan
@@ -407,6 +877,42 @@ def calculate_nmi_between_communities(
         return np.nan
 
 
+def detect_onset_climax_arrays(
+    peak_mean: np.ndarray,
+    peak_median: np.ndarray,
+    peak_mean_threshold: float = 3.0,
+    peak_median_threshold: float = 5.0
+) -> Tuple[Optional[int], Optional[int]]:
+    """
+    Detect onset and climax positions from plain per-window arrays.
+    
+    Args:
+        peak_mean: peak_mean value per window
+        peak_median: peak_median value per window
+        peak_mean_threshold: Threshold for onset detection (peak_mean)
+        peak_median_threshold: Threshold for onset detection (peak_median)
+        
+    Returns:
+        Tuple of (onset, climax) positions, or None where not found
+    """
+    if len(peak_mean) == 0:
+        return None, None
+    
+    # Detect onset
+    onset_mask = (peak_mean >= peak_mean_threshold) | (peak_median >= peak_median_threshold)
+    onset = int(np.argmax(onset_mask))
+    
+    if not onset_mask[onset]:
+        return None, None
+    
+    # Detect climax (first global maximum after onset)
+    post_onset = peak_mean[onset:]
+    if np.isnan(post_onset).all():
+        return onset, None
+    
+    return onset, onset + int(np.nanargmax(post_onset))
+
+
 def detect_onset_climax(
     metrics_series: pd.DataFrame,
     peak_mean_threshold: float = 3.0,
@@ -426,61 +932,69 @@ def detect_onset_climax(
     if len(metrics_series) == 0:
         return None, None
     
-    # Detect onset
-    onset_mask = (
-        (metrics_series['peak_mean'] >= peak_mean_threshold) |
-        (metrics_series['peak_median'] >= peak_median_threshold)
+    onset_pos, climax_window = detect_onset_climax_arrays(
+        np.asarray(metrics_series['peak_mean'], dtype=np.float64),
+        np.asarray(metrics_series['peak_median'], dtype=np.float64),
+        peak_mean_threshold,
+        peak_median_threshold
     )
     
-    onset_windows = metrics_series[onset_mask].index.tolist()
-    onset_window = onset_windows[0] if onset_windows else None
-    
-    # Detect climax (first global maximum after onset)
-    if onset_window is not None:
-        post_onset = metrics_series.loc[onset_window:]
-        if len(post_onset) > 0:
-            climax_idx = post_onset['peak_mean'].idxmax()
-            climax_window = metrics_series.index.get_loc(climax_idx)
-        else:
-            climax_window = None
-    else:
-        climax_window = None
+    if onset_pos is None:
+        return None, None
     
-    return onset_window, climax_window
+    return metrics_series.index[onset_pos], climax_window
 
 
 def calculate_time_to_isolation(
     metrics_series: pd.DataFrame,
     ego_density_threshold: float = 0.05,
     min_windows: int = 1
-) -> Optional[int]:
+) -> Optional[Any]:
     """
     Calculate time to isolation for victim.
     
+    The victim counts as isolated from the first window that starts a run
+    of at least min_windows consecutive isolated windows; isolated windows
+    separated by a non-isolated one do not add up.
+    
     Args:
         metrics_series: DataFrame with metrics over time
         ego_density_threshold: Threshold for ego density
-        min_windows: Minimum number of windows for isolation
+        min_windows: Minimum number of consecutive windows for isolation
         
     Returns:
-        Number of windows to isolation (None if not isolated)
+        Index label of the window where isolation starts (None if not isolated)
     """
-    if len(metrics_series) == 0:
+    min_windows = max(min_windows, 1)
+    if len(metrics_series) < min_windows:
         return None
     
-    # Find first window where victim is isolated
     isolation_mask = (
-        (metrics_series['victim_reciprocity'] == 0) &
-        (metrics_series['victim_scc_size'] == 1) &
-        (metrics_series['victim_ego_density'] <= ego_density_threshold)
+        (np.asarray(metrics_series['victim_reciprocity']) == 0) &
+        (np.asarray(metrics_series['victim_scc_size']) == 1) &
+        (np.asarray(metrics_series['victim_ego_density']) <= ego_density_threshold)
     )
     
-    isolated_windows = metrics_series[isolation_mask].index.tolist()
+    # Windows whose next min_windows entries are all isolated
+    run_starts = np.convolve(
+        isolation_mask.astype(np.int32), np.ones(min_windows, dtype=np.int32), mode='valid'
+    ) == min_windows
     
-    if len(isolated_windows) >= min_windows:
-        return isolated_windows[0]
-    else:
-        return None
+    if run_starts.any():
+        return metrics_series.index[int(np.argmax(run_starts))]
+    
+    return None
+
+
+@njit(cache=True)
+def _half_life(values: np.ndarray, peak_idx: int, half_value: float) -> int:
+    """
+    Steps after peak_idx until values first drops to half_value (-1 if never).
+    """
+    for i in range(peak_idx + 1, len(values)):
+        if values[i] <= half_value:
+            return i - peak_idx
+    return -1
 
 
 def calculate_half_life(
@@ -502,15 +1016,51 @@ def calculate_half_life(
     if peak_idx >= len(values) - 1:
         return None
     
-    peak_value = values.iloc[peak_idx]
+    v = np.asarray(values, dtype=np.float64)
+    
+    peak_value = v[peak_idx]
     if baseline is None:
-        baseline = values.iloc[0]
+        baseline = v[0]
     
     half_value = baseline + (peak_value - baseline) / 2
     
     # Look for first value below half
-    for i in range(peak_idx + 1, len(values)):
-        if values.iloc[i] <= half_value:
-            return i - peak_idx
+    steps = _half_life(v, peak_idx, half_value)
+    return int(steps) if steps >= 0 else None
+
+
+def calculate_half_life_batch(
+    values: np.ndarray,
+    peak_idx: np.ndarray,
+    baseline: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """
+    Calculate half-lives of many series at once.
     
-    return None
+    Row-wise equivalent of calculate_half_life for series of equal length.
+    
+    Args:
+        values: 2D array with one series per row
+        peak_idx: Index of the peak in each row
+        baseline: Baseline value per row (if None, use each row's first value)
+        
+    Returns:
+        Integer array of steps to reach half-life (-1 where not reached)
+    """
+    values = np.asarray(values, dtype=np.float64)
+    peak_idx = np.asarray(peak_idx, dtype=np.int64)
+    n_series, n_steps = values.shape
+    rows = np.arange(n_series)
+    
+    if baseline is None:
+        baseline = values[:, 0]
+    baseline = np.asarray(baseline, dtype=np.float64)
+    
+    half_value = baseline + (values[rows, peak_idx] - baseline) / 2
+    
+    # Only steps after the peak count
+    after_peak = np.arange(n_steps) > peak_idx[:, None]
+    reached = after_peak & (values <= half_value[:, None])
+    
+    first = reached.argmax(axis=1)
+    return np.where(reached[rows, first], first - peak_idx, -1)
@@ -2,40 +2,195 @@
 Visualization utilities for temporal network analysis.
 """
 
-import matplotlib
-# Set backend before importing pyplot
-matplotlib.use('Agg')  # Use non-interactive backend
-
-import matplotlib.pyplot as plt
-import matplotlib.dates as mdates
 import pandas as pd
 import numpy as np
 from typing import Dict, Any, Optional, List, Tuple
+import io
 import logging
 import os
-
-# Try to import seaborn, but make it optional
-try:
-    import seaborn as sns
-    SEABORN_AVAILABLE = True
-except ImportError:
-    SEABORN_AVAILABLE = False
-    sns = None
+from concurrent.futures import ProcessPoolExecutor
 
 logger = logging.getLogger(__name__)
 
-# Set style
-if SEABORN_AVAILABLE:
-    plt.style.use('seaborn-v0_8')
-    sns.set_palette("husl")
-else:
-    plt.style.use('default')
+# Dose-response panels with more windows than this are drawn as hexbin
+# densities instead of one marker per window
+HEXBIN_THRESHOLD = 1000
+_HEXBIN_CMAPS = {'red': 'Reds', 'green': 'Greens', 'purple': 'Purples'}
+
+# matplotlib and seaborn are imported on first use by _lazy_mpl(), so
+# importing this module (and the package) stays cheap for non-plotting callers
+matplotlib = None
+mdates = None
+setp = None
+Figure = None
+FigureCanvasAgg = None
+sns = None
+SEABORN_AVAILABLE = None
+
+
+def _lazy_mpl() -> None:
+    """Import matplotlib (Agg backend) and seaborn and set the plot style, once."""
+    global matplotlib, mdates, setp, Figure, FigureCanvasAgg, sns, SEABORN_AVAILABLE
+    
+    if matplotlib is not None:
+        return
+    
+    import matplotlib as mpl
+    # Set backend before anything can pull in pyplot
+    mpl.use('Agg')  # Use non-interactive backend
+    
+    from matplotlib import dates as _dates
+    from matplotlib.artist import setp as _setp
+    from matplotlib.backends.backend_agg import FigureCanvasAgg as _FigureCanvasAgg
+    from matplotlib.figure import Figure as _Figure
+    
+    # Try to import seaborn, but make it optional
+    try:
+        import seaborn
+        SEABORN_AVAILABLE = True
+    except ImportError:
+        seaborn = None
+        SEABORN_AVAILABLE = False
+    
+    # Set style
+    if SEABORN_AVAILABLE:
+        mpl.style.use('seaborn-v0_8')
+        seaborn.set_palette("husl")
+    else:
+        mpl.style.use('default')
+    
+    # Split long line paths into chunks so Agg doesn't render them in one pass
+    mpl.rcParams['agg.path.chunksize'] = 10000
+    
+    mdates = _dates
+    setp = _setp
+    Figure = _Figure
+    FigureCanvasAgg = _FigureCanvasAgg
+    sns = seaborn
+    matplotlib = mpl
+
+
+def _new_figure(figsize: Tuple[int, int], nrows: int = 1, ncols: int = 1, **kwargs):
+    """
+    Create a figure on an Agg canvas without going through pyplot.
+    
+    Figures made this way are not registered with pyplot's figure manager,
+    so there is no global state to track or close. Layout is solved by the
+    constrained layout engine at draw time, so callers need neither
+    tight_layout() nor bbox_inches='tight'.
+    
+    Args:
+        figsize: Figure size
+        nrows: Number of subplot rows
+        ncols: Number of subplot columns
+        **kwargs: Passed to Figure.subplots (e.g. sharex)
+        
+    Returns:
+        Tuple of (figure, axes) as returned by plt.subplots
+    """
+    fig = Figure(figsize=figsize, constrained_layout=True)
+    FigureCanvasAgg(fig)
+    return fig, fig.subplots(nrows, ncols, **kwargs)
+
+
+def _save_figure(fig: 'Figure', output_path: str, dpi: int = 300) -> None:
+    """
+    Save a figure; the format follows the file extension (PNG, PDF, SVG).
+    
+    The figure is rendered into memory and written with a single write, so
+    the renderer never holds the output file open and a failed render
+    leaves no partial file behind.
+    
+    Args:
+        fig: Figure to save
+        output_path: Path to save the plot
+        dpi: Output resolution
+    """
+    fmt = os.path.splitext(output_path)[1][1:].lower() or 'png'
+    kwargs = {}
+    if fmt == 'png':
+        # zlib level 3 encodes several times faster than the default 6 for
+        # flat-colour plots at a small size cost
+        kwargs['pil_kwargs'] = {'compress_level': 3}
+    
+    buf = io.BytesIO()
+    fig.savefig(buf, format=fmt, dpi=dpi, **kwargs)
+    with open(output_path, 'wb') as f:
+        f.write(buf.getbuffer())
+
+
+def _time_axis(metrics_df: pd.DataFrame) -> np.ndarray:
+    """
+    Get x values for time-series plots.
+    
+    Args:
+        metrics_df: DataFrame with metrics over time
+        
+    Returns:
+        Window start times as datetime64 array, or window positions if the
+        DataFrame has no t_start column
+    """
+    if 't_start' in metrics_df.columns:
+        return pd.to_datetime(metrics_df['t_start']).to_numpy()
+    return np.arange(len(metrics_df))
+
+
+def _is_time_axis(x: np.ndarray) -> bool:
+    """Whether x holds datetimes (and needs date tick formatting)."""
+    return np.issubdtype(x.dtype, np.datetime64)
+
+
+def _column_major(metrics_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Ensure every column of metrics_df is contiguous in memory.
+    
+    A DataFrame built from a 2D row-major array stores each column as a
+    strided view; plotting reads whole columns, so such frames are copied
+    column by column first.
+    
+    Args:
+        metrics_df: DataFrame with metrics over time
+        
+    Returns:
+        metrics_df itself if its columns are already contiguous, otherwise a
+        column-major copy
+    """
+    if all(metrics_df[col].to_numpy().flags.c_contiguous for col in metrics_df.columns):
+        return metrics_df
+    return pd.DataFrame(
+        {col: np.ascontiguousarray(metrics_df[col].to_numpy()) for col in metrics_df.columns},
+        index=metrics_df.index
+    )
+
+
+def _dose_points(ax, pct: np.ndarray, values: np.ndarray, color: Optional[str] = None) -> None:
+    """
+    Draw one dose-response panel.
+    
+    Up to HEXBIN_THRESHOLD windows are drawn as individual markers; above
+    that, overlapping markers are binned into a hexbin density plot so the
+    draw cost no longer grows with the number of windows.
+    
+    Args:
+        ax: Axes to draw on
+        pct: Group percentage per window (x values)
+        values: Metric value per window (y values)
+        color: Marker colour (also selects the hexbin colour map)
+    """
+    if len(pct) > HEXBIN_THRESHOLD:
+        finite = np.isfinite(pct) & np.isfinite(values)
+        ax.hexbin(pct[finite], values[finite], gridsize=40, mincnt=1,
+                  cmap=_HEXBIN_CMAPS.get(color, 'Blues'))
+    else:
+        ax.plot(pct, values, 'o', markersize=6, alpha=0.6, color=color)
 
 
 def create_burst_series_plot(
     metrics_df: pd.DataFrame,
     output_path: str,
-    figsize: Tuple[int, int] = (12, 8)
+    figsize: Tuple[int, int] = (12, 8),
+    x: Optional[np.ndarray] = None,
+    dpi: int = 300
 ) -> None:
     """
     Create burst series plot with onset and climax markers.
@@ -44,31 +199,40 @@ def create_burst_series_plot(
         metrics_df: DataFrame with metrics over time
         output_path: Path to save the plot
         figsize: Figure size
+        x: Precomputed x values (see _time_axis)
+        dpi: Output resolution
     """
-    fig, (ax1, ax2) = plt.subplots(2, 1, figsize=figsize, sharex=True)
+    _lazy_mpl()
+    
+    cols = frozenset(metrics_df.columns)
+    
+    fig, (ax1, ax2) = _new_figure(figsize, 2, 1, sharex=True)
     
     # Plot peak mean and median
-    if 't_start' in metrics_df.columns:
-        x = pd.to_datetime(metrics_df['t_start'])
-    else:
-        x = range(len(metrics_df))
+    if x is None:
+        x = _time_axis(metrics_df)
     
-    ax1.plot(x, metrics_df['peak_mean'], label='Peak Mean', linewidth=2)
-    ax1.plot(x, metrics_df['peak_median'], label='Peak Median', linewidth=2, linestyle='--')
+    peak_mean = metrics_df['peak_mean'].to_numpy()
     
-    # Mark onset and climax
-    onset_mask = metrics_df.get('onset_flag', False)
-    climax_mask = metrics_df.get('climax_flag', False)
+    ax1.plot(x, peak_mean, label='Peak Mean', linewidth=2)
+    ax1.plot(x, metrics_df['peak_median'].to_numpy(), label='Peak Median', linewidth=2, linestyle='--')
     
-    if onset_mask.any():
-        onset_x = x[onset_mask]
-        onset_y = metrics_df.loc[onset_mask, 'peak_mean']
-        ax1.scatter(onset_x, onset_y, color='red', s=100, label='Onset', zorder=5)
+    # Mark onset and climax (flag columns may be absent or NaN-padded)
+    no_windows = np.empty(0, dtype=np.intp)
+    onset_idx = (
+        np.flatnonzero(metrics_df['onset_flag'].eq(True).to_numpy())
+        if 'onset_flag' in cols else no_windows
+    )
+    climax_idx = (
+        np.flatnonzero(metrics_df['climax_flag'].eq(True).to_numpy())
+        if 'climax_flag' in cols else no_windows
+    )
     
-    if climax_mask.any():
-        climax_x = x[climax_mask]
-        climax_y = metrics_df.loc[climax_mask, 'peak_mean']
-        ax1.scatter(climax_x, climax_y, color='orange', s=100, label='Climax', zorder=5)
+    if onset_idx.size:
+        ax1.scatter(x[onset_idx], peak_mean[onset_idx], color='red', s=100, label='Onset', zorder=5)
+    
+    if climax_idx.size:
+        ax1.scatter(x[climax_idx], peak_mean[climax_idx], color='orange', s=100, label='Climax', zorder=5)
     
     ax1.set_ylabel('Activity Level')
     ax1.set_title('Burst Detection: Peak Mean and Median')
@@ -76,8 +240,8 @@ def create_burst_series_plot(
     ax1.grid(True, alpha=0.3)
     
     # Plot network size
-    ax2.plot(x, metrics_df['n_nodes'], label='Nodes', linewidth=2)
-    ax2.plot(x, metrics_df['n_edges'], label='Edges', linewidth=2)
+    ax2.plot(x, metrics_df['n_nodes'].to_numpy(), label='Nodes', linewidth=2)
+    ax2.plot(x, metrics_df['n_edges'].to_numpy(), label='Edges', linewidth=2)
     ax2.set_ylabel('Count')
     ax2.set_xlabel('Time')
     ax2.set_title('Network Size Over Time')
@@ -85,14 +249,12 @@ def create_burst_series_plot(
     ax2.grid(True, alpha=0.3)
     
     # Format x-axis
-    if 't_start' in metrics_df.columns:
+    if _is_time_axis(x):
         ax2.xaxis.set_major_formatter(mdates.DateFormatter('%Y-%m-%d'))
         ax2.xaxis.set_major_locator(mdates.DayLocator(interval=1))
-        plt.setp(ax2.xaxis.get_majorticklabels(), rotation=45)
+        setp(ax2.xaxis.get_majorticklabels(), rotation=45)
     
-    plt.tight_layout()
-    plt.savefig(output_path, dpi=300, bbox_inches='tight')
-    plt.close()
+    _save_figure(fig, output_path, dpi)
     
     logger.info(f"Burst series plot saved to {output_path}")
 
@@ -100,7 +262,9 @@ def create_burst_series_plot(
 def create_topk_centralization_plot(
     metrics_df: pd.DataFrame,
     output_path: str,
-    figsize: Tuple[int, int] = (12, 8)
+    figsize: Tuple[int, int] = (12, 8),
+    x: Optional[np.ndarray] = None,
+    dpi: int = 300
 ) -> None:
     """
     Create top-k centralization plot.
@@ -109,19 +273,23 @@ def create_topk_centralization_plot(
         metrics_df: DataFrame with metrics over time
         output_path: Path to save the plot
         figsize: Figure size
+        x: Precomputed x values (see _time_axis)
+        dpi: Output resolution
     """
-    fig, (ax1, ax2) = plt.subplots(2, 1, figsize=figsize, sharex=True)
+    _lazy_mpl()
     
-    if 't_start' in metrics_df.columns:
-        x = pd.to_datetime(metrics_df['t_start'])
-    else:
-        x = range(len(metrics_df))
+    cols = frozenset(metrics_df.columns)
+    
+    fig, (ax1, ax2) = _new_figure(figsize, 2, 1, sharex=True)
+    
+    if x is None:
+        x = _time_axis(metrics_df)
     
     # Plot top-k PageRank shares
-    if 'topk_pr_share_k5' in metrics_df.columns:
-        ax1.plot(x, metrics_df['topk_pr_share_k5'], label='Top-5 PR Share', linewidth=2)
-    if 'topk_pr_share_k10' in metrics_df.columns:
-        ax1.plot(x, metrics_df['topk_pr_share_k10'], label='Top-10 PR Share', linewidth=2)
+    if 'topk_pr_share_k5' in cols:
+        ax1.plot(x, metrics_df['topk_pr_share_k5'].to_numpy(), label='Top-5 PR Share', linewidth=2)
+    if 'topk_pr_share_k10' in cols:
+        ax1.plot(x, metrics_df['topk_pr_share_k10'].to_numpy(), label='Top-10 PR Share', linewidth=2)
     
     ax1.set_ylabel('Share')
     ax1.set_title('Top-K PageRank Share Over Time')
@@ -129,8 +297,8 @@ def create_topk_centralization_plot(
     ax1.grid(True, alpha=0.3)
     
     # Plot betweenness centralization
-    if 'betweenness_centralization' in metrics_df.columns:
-        ax2.plot(x, metrics_df['betweenness_centralization'], 
+    if 'betweenness_centralization' in cols:
+        ax2.plot(x, metrics_df['betweenness_centralization'].to_numpy(), 
                 label='Betweenness Centralization', linewidth=2, color='red')
     
     ax2.set_ylabel('Centralization')
@@ -140,14 +308,12 @@ def create_topk_centralization_plot(
     ax2.grid(True, alpha=0.3)
     
     # Format x-axis
-    if 't_start' in metrics_df.columns:
+    if _is_time_axis(x):
         ax2.xaxis.set_major_formatter(mdates.DateFormatter('%Y-%m-%d'))
         ax2.xaxis.set_major_locator(mdates.DayLocator(interval=1))
-        plt.setp(ax2.xaxis.get_majorticklabels(), rotation=45)
+        setp(ax2.xaxis.get_majorticklabels(), rotation=45)
     
-    plt.tight_layout()
-    plt.savefig(output_path, dpi=300, bbox_inches='tight')
-    plt.close()
+    _save_figure(fig, output_path, dpi)
     
     logger.info(f"Top-k centralization plot saved to {output_path}")
 
@@ -155,7 +321,9 @@ def create_topk_centralization_plot(
 def create_nmi_series_plot(
     metrics_df: pd.DataFrame,
     output_path: str,
-    figsize: Tuple[int, int] = (10, 6)
+    figsize: Tuple[int, int] = (10, 6),
+    x: Optional[np.ndarray] = None,
+    dpi: int = 300
 ) -> None:
     """
     Create NMI series plot.
@@ -164,16 +332,20 @@ def create_nmi_series_plot(
         metrics_df: DataFrame with metrics over time
         output_path: Path to save the plot
         figsize: Figure size
+        x: Precomputed x values (see _time_axis)
+        dpi: Output resolution
     """
-    fig, ax = plt.subplots(figsize=figsize)
+    _lazy_mpl()
     
-    if 't_start' in metrics_df.columns:
-        x = pd.to_datetime(metrics_df['t_start'])
-    else:
-        x = range(len(metrics_df))
+    cols = frozenset(metrics_df.columns)
     
-    if 'nmi_next' in metrics_df.columns:
-        ax.plot(x, metrics_df['nmi_next'], label='NMI with Next Window', linewidth=2)
+    fig, ax = _new_figure(figsize)
+    
+    if x is None:
+        x = _time_axis(metrics_df)
+    
+    if 'nmi_next' in cols:
+        ax.plot(x, metrics_df['nmi_next'].to_numpy(), label='NMI with Next Window', linewidth=2)
     
     ax.set_ylabel('NMI Score')
     ax.set_xlabel('Time')
@@ -182,14 +354,12 @@ def create_nmi_series_plot(
     ax.grid(True, alpha=0.3)
     
     # Format x-axis
-    if 't_start' in metrics_df.columns:
+    if _is_time_axis(x):
         ax.xaxis.set_major_formatter(mdates.DateFormatter('%Y-%m-%d'))
         ax.xaxis.set_major_locator(mdates.DayLocator(interval=1))
-        plt.setp(ax.xaxis.get_majorticklabels(), rotation=45)
+        setp(ax.xaxis.get_majorticklabels(), rotation=45)
     
-    plt.tight_layout()
-    plt.savefig(output_path, dpi=300, bbox_inches='tight')
-    plt.close()
+    _save_figure(fig, output_path, dpi)
     
     logger.info(f"NMI series plot saved to {output_path}")
 
@@ -197,7 +367,9 @@ def create_nmi_series_plot(
 def create_isolation_victim_plot(
     metrics_df: pd.DataFrame,
     output_path: str,
-    figsize: Tuple[int, int] = (12, 8)
+    figsize: Tuple[int, int] = (12, 8),
+    x: Optional[np.ndarray] = None,
+    dpi: int = 300
 ) -> None:
     """
     Create victim isolation plot.
@@ -206,54 +378,62 @@ def create_isolation_victim_plot(
         metrics_df: DataFrame with metrics over time
         output_path: Path to save the plot
         figsize: Figure size
+        x: Precomputed x values (see _time_axis)
+        dpi: Output resolution
     """
-    fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=figsize, sharex=True)
+    _lazy_mpl()
     
-    if 't_start' in metrics_df.columns:
-        x = pd.to_datetime(metrics_df['t_start'])
-    else:
-        x = range(len(metrics_df))
+    # Read every plotted column once, up front
+    arrays = {
+        col: metrics_df[col].to_numpy()
+        for col in ('victim_reciprocity', 'victim_scc_size', 'victim_ego_density', 'victim_inshare')
+        if col in metrics_df.columns
+    }
+    
+    fig, ((ax1, ax2), (ax3, ax4)) = _new_figure(figsize, 2, 2, sharex=True)
+    
+    if x is None:
+        x = _time_axis(metrics_df)
     
     # Reciprocity
-    if 'victim_reciprocity' in metrics_df.columns:
-        ax1.plot(x, metrics_df['victim_reciprocity'], label='Reciprocity', linewidth=2)
+    if 'victim_reciprocity' in arrays:
+        ax1.plot(x, arrays['victim_reciprocity'], label='Reciprocity', linewidth=2)
     ax1.set_ylabel('Reciprocity Count')
     ax1.set_title('Victim Reciprocity Over Time')
     ax1.grid(True, alpha=0.3)
     
     # SCC size
-    if 'victim_scc_size' in metrics_df.columns:
-        ax2.plot(x, metrics_df['victim_scc_size'], label='SCC Size', linewidth=2, color='red')
+    if 'victim_scc_size' in arrays:
+        ax2.plot(x, arrays['victim_scc_size'], label='SCC Size', linewidth=2, color='red')
     ax2.set_ylabel('SCC Size')
     ax2.set_title('Victim SCC Size Over Time')
     ax2.grid(True, alpha=0.3)
     
     # Ego density
-    if 'victim_ego_density' in metrics_df.columns:
-        ax3.plot(x, metrics_df['victim_ego_density'], label='Ego Density', linewidth=2, color='green')
+    if 'victim_ego_density' in arrays:
+        ax3.plot(x, arrays['victim_ego_density'], label='Ego Density', linewidth=2, color='green')
     ax3.set_ylabel('Ego Density')
     ax3.set_xlabel('Time')
     ax3.set_title('Victim Ego Density Over Time')
     ax3.grid(True, alpha=0.3)
     
     # In-degree share
-    if 'victim_inshare' in metrics_df.columns:
-        ax4.plot(x, metrics_df['victim_inshare'], label='In-degree Share', linewidth=2, color='purple')
+    if 'victim_inshare' in arrays:
+        ax4.plot(x, arrays['victim_inshare'], label='In-degree Share', linewidth=2, color='purple')
     ax4.set_ylabel('In-degree Share')
     ax4.set_xlabel('Time')
     ax4.set_title('Victim In-degree Share Over Time')
     ax4.grid(True, alpha=0.3)
     
-    # Format x-axis
-    if 't_start' in metrics_df.columns:
+    # Format x-axis; the axes share x, so one formatter/locator pair serves
+    # them all
+    if _is_time_axis(x):
+        ax3.xaxis.set_major_formatter(mdates.DateFormatter('%Y-%m-%d'))
+        ax3.xaxis.set_major_locator(mdates.DayLocator(interval=1))
         for ax in [ax3, ax4]:
-            ax.xaxis.set_major_formatter(mdates.DateFormatter('%Y-%m-%d'))
-            ax.xaxis.set_major_locator(mdates.DayLocator(interval=1))
-            plt.setp(ax.xaxis.get_majorticklabels(), rotation=45)
+            setp(ax.xaxis.get_majorticklabels(), rotation=45)
     
-    plt.tight_layout()
-    plt.savefig(output_path, dpi=300, bbox_inches='tight')
-    plt.close()
+    _save_figure(fig, output_path, dpi)
     
     logger.info(f"Isolation victim plot saved to {output_path}")
 
@@ -262,7 +442,8 @@ def create_dose_response_skeptics_plot(
     metrics_df: pd.DataFrame,
     output_path: str,
     skeptic_col: str = 'label_skeptic',
-    figsize: Tuple[int, int] = (12, 8)
+    figsize: Tuple[int, int] = (12, 8),
+    dpi: int = 300
 ) -> None:
     """
     Create dose-response plot for skeptics.
@@ -272,48 +453,51 @@ def create_dose_response_skeptics_plot(
         output_path: Path to save the plot
         skeptic_col: Name of skeptic column
         figsize: Figure size
+        dpi: Output resolution
     """
-    fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=figsize)
+    _lazy_mpl()
+    
+    cols = frozenset(metrics_df.columns)
+    
+    fig, ((ax1, ax2), (ax3, ax4)) = _new_figure(figsize, 2, 2)
     
     # Calculate skeptic percentage per window
-    if skeptic_col in metrics_df.columns:
-        skeptic_pct = metrics_df[skeptic_col] * 100
+    if skeptic_col in cols:
+        skeptic_pct = metrics_df[skeptic_col].to_numpy() * 100
         
         # Plot peak mean by skeptic percentage
-        if 'peak_mean' in metrics_df.columns:
-            ax1.scatter(skeptic_pct, metrics_df['peak_mean'], alpha=0.6)
+        if 'peak_mean' in cols:
+            _dose_points(ax1, skeptic_pct, metrics_df['peak_mean'].to_numpy())
             ax1.set_xlabel('Skeptic Percentage (%)')
             ax1.set_ylabel('Peak Mean')
             ax1.set_title('Peak Mean vs Skeptic Percentage')
             ax1.grid(True, alpha=0.3)
         
         # Plot betweenness share by skeptic percentage
-        if 'betweenness_share_skeptic' in metrics_df.columns:
-            ax2.scatter(skeptic_pct, metrics_df['betweenness_share_skeptic'], alpha=0.6, color='red')
+        if 'betweenness_share_skeptic' in cols:
+            _dose_points(ax2, skeptic_pct, metrics_df['betweenness_share_skeptic'].to_numpy(), color='red')
             ax2.set_xlabel('Skeptic Percentage (%)')
             ax2.set_ylabel('Betweenness Share (Skeptics)')
             ax2.set_title('Skeptic Betweenness Share vs Percentage')
             ax2.grid(True, alpha=0.3)
         
         # Plot assortativity by skeptic percentage
-        if 'assort_skeptic' in metrics_df.columns:
-            ax3.scatter(skeptic_pct, metrics_df['assort_skeptic'], alpha=0.6, color='green')
+        if 'assort_skeptic' in cols:
+            _dose_points(ax3, skeptic_pct, metrics_df['assort_skeptic'].to_numpy(), color='green')
             ax3.set_xlabel('Skeptic Percentage (%)')
             ax3.set_ylabel('Assortativity (Skeptics)')
             ax3.set_title('Skeptic Assortativity vs Percentage')
             ax3.grid(True, alpha=0.3)
         
         # Plot victim in-degree share by skeptic percentage
-        if 'victim_inshare' in metrics_df.columns:
-            ax4.scatter(skeptic_pct, metrics_df['victim_inshare'], alpha=0.6, color='purple')
+        if 'victim_inshare' in cols:
+            _dose_points(ax4, skeptic_pct, metrics_df['victim_inshare'].to_numpy(), color='purple')
             ax4.set_xlabel('Skeptic Percentage (%)')
             ax4.set_ylabel('Victim In-degree Share')
             ax4.set_title('Victim In-degree Share vs Skeptic Percentage')
             ax4.grid(True, alpha=0.3)
     
-    plt.tight_layout()
-    plt.savefig(output_path, dpi=300, bbox_inches='tight')
-    plt.close()
+    _save_figure(fig, output_path, dpi)
     
     logger.info(f"Dose-response skeptics plot saved to {output_path}")
 
@@ -322,7 +506,8 @@ def create_dose_response_friendly_plot(
     metrics_df: pd.DataFrame,
     output_path: str,
     friendly_col: str = 'label_friendly',
-    figsize: Tuple[int, int] = (12, 8)
+    figsize: Tuple[int, int] = (12, 8),
+    dpi: int = 300
 ) -> None:
     """
     Create dose-response plot for friendly nodes.
@@ -332,48 +517,51 @@ def create_dose_response_friendly_plot(
         output_path: Path to save the plot
         friendly_col: Name of friendly column
         figsize: Figure size
+        dpi: Output resolution
     """
-    fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=figsize)
+    _lazy_mpl()
+    
+    cols = frozenset(metrics_df.columns)
+    
+    fig, ((ax1, ax2), (ax3, ax4)) = _new_figure(figsize, 2, 2)
     
     # Calculate friendly percentage per window
-    if friendly_col in metrics_df.columns:
-        friendly_pct = metrics_df[friendly_col] * 100
+    if friendly_col in cols:
+        friendly_pct = metrics_df[friendly_col].to_numpy() * 100
         
         # Plot graph density by friendly percentage
-        if 'graph_density' in metrics_df.columns:
-            ax1.scatter(friendly_pct, metrics_df['graph_density'], alpha=0.6)
+        if 'graph_density' in cols:
+            _dose_points(ax1, friendly_pct, metrics_df['graph_density'].to_numpy())
             ax1.set_xlabel('Friendly Percentage (%)')
             ax1.set_ylabel('Graph Density')
             ax1.set_title('Graph Density vs Friendly Percentage')
             ax1.grid(True, alpha=0.3)
         
         # Plot average path length by friendly percentage
-        if 'avg_path_len' in metrics_df.columns:
-            ax2.scatter(friendly_pct, metrics_df['avg_path_len'], alpha=0.6, color='red')
+        if 'avg_path_len' in cols:
+            _dose_points(ax2, friendly_pct, metrics_df['avg_path_len'].to_numpy(), color='red')
             ax2.set_xlabel('Friendly Percentage (%)')
             ax2.set_ylabel('Average Path Length')
             ax2.set_title('Average Path Length vs Friendly Percentage')
             ax2.grid(True, alpha=0.3)
         
         # Plot effective diameter by friendly percentage
-        if 'eff_diameter' in metrics_df.columns:
-            ax3.scatter(friendly_pct, metrics_df['eff_diameter'], alpha=0.6, color='green')
+        if 'eff_diameter' in cols:
+            _dose_points(ax3, friendly_pct, metrics_df['eff_diameter'].to_numpy(), color='green')
             ax3.set_xlabel('Friendly Percentage (%)')
             ax3.set_ylabel('Effective Diameter')
             ax3.set_title('Effective Diameter vs Friendly Percentage')
             ax3.grid(True, alpha=0.3)
         
         # Plot victim in-degree share by friendly percentage
-        if 'victim_inshare' in metrics_df.columns:
-            ax4.scatter(friendly_pct, metrics_df['victim_inshare'], alpha=0.6, color='purple')
+        if 'victim_inshare' in cols:
+            _dose_points(ax4, friendly_pct, metrics_df['victim_inshare'].to_numpy(), color='purple')
             ax4.set_xlabel('Friendly Percentage (%)')
             ax4.set_ylabel('Victim In-degree Share')
             ax4.set_title('Victim In-degree Share vs Friendly Percentage')
             ax4.grid(True, alpha=0.3)
     
-    plt.tight_layout()
-    plt.savefig(output_path, dpi=300, bbox_inches='tight')
-    plt.close()
+    _save_figure(fig, output_path, dpi)
     
     logger.info(f"Dose-response friendly plot saved to {output_path}")
 
@@ -381,7 +569,9 @@ def create_dose_response_friendly_plot(
 def create_residual_panel_plot(
     metrics_df: pd.DataFrame,
     output_path: str,
-    figsize: Tuple[int, int] = (12, 8)
+    figsize: Tuple[int, int] = (12, 8),
+    x: Optional[np.ndarray] = None,
+    dpi: int = 300
 ) -> None:
     """
     Create residual panel plot for post-ritual analysis.
@@ -390,56 +580,71 @@ def create_residual_panel_plot(
         metrics_df: DataFrame with metrics over time
         output_path: Path to save the plot
         figsize: Figure size
+        x: Precomputed x values (see _time_axis)
+        dpi: Output resolution
     """
-    fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=figsize, sharex=True)
-    
-    if 't_start' in metrics_df.columns:
-        x = pd.to_datetime(metrics_df['t_start'])
-    else:
-        x = range(len(metrics_df))
+    _lazy_mpl()
+    
+    # Read every plotted column once, up front
+    arrays = {
+        col: metrics_df[col].to_numpy()
+        for col in ('victim_ego_density', 'median_distance_to_victim', 'victim_inshare',
+                    'victim_inshare_half_life')
+        if col in metrics_df.columns
+    }
+    
+    # The half-life bars are indexed by window number, not time, so ax4 keeps
+    # its own x axis; sharing it would run the date locator over bar positions
+    fig, ((ax1, ax2), (ax3, ax4)) = _new_figure(figsize, 2, 2)
+    ax2.sharex(ax1)
+    ax3.sharex(ax1)
+    ax1.tick_params(labelbottom=False)
+    
+    if x is None:
+        x = _time_axis(metrics_df)
     
     # Ego density over time
-    if 'victim_ego_density' in metrics_df.columns:
-        ax1.plot(x, metrics_df['victim_ego_density'], label='Ego Density', linewidth=2)
+    if 'victim_ego_density' in arrays:
+        ax1.plot(x, arrays['victim_ego_density'], label='Ego Density', linewidth=2)
     ax1.set_ylabel('Ego Density')
     ax1.set_title('Victim Ego Density Over Time')
     ax1.grid(True, alpha=0.3)
     
     # Median distance to victim
-    if 'median_distance_to_victim' in metrics_df.columns:
-        ax2.plot(x, metrics_df['median_distance_to_victim'], label='Median Distance', linewidth=2, color='red')
+    if 'median_distance_to_victim' in arrays:
+        ax2.plot(x, arrays['median_distance_to_victim'], label='Median Distance', linewidth=2, color='red')
     ax2.set_ylabel('Median Distance')
     ax2.set_title('Median Distance to Victim Over Time')
     ax2.grid(True, alpha=0.3)
     
     # Victim in-degree share
-    if 'victim_inshare' in metrics_df.columns:
-        ax3.plot(x, metrics_df['victim_inshare'], label='In-degree Share', linewidth=2, color='green')
+    if 'victim_inshare' in arrays:
+        ax3.plot(x, arrays['victim_inshare'], label='In-degree Share', linewidth=2, color='green')
     ax3.set_ylabel('In-degree Share')
     ax3.set_xlabel('Time')
     ax3.set_title('Victim In-degree Share Over Time')
     ax3.grid(True, alpha=0.3)
     
     # Half-life indicator
-    if 'victim_inshare_half_life' in metrics_df.columns:
-        half_life_data = metrics_df['victim_inshare_half_life'].dropna()
+    if 'victim_inshare_half_life' in arrays:
+        half_life_data = arrays['victim_inshare_half_life']
+        half_life_data = half_life_data[~pd.isna(half_life_data)]
         if len(half_life_data) > 0:
-            ax4.bar(range(len(half_life_data)), half_life_data, alpha=0.7, color='purple')
+            ax4.bar(np.arange(len(half_life_data)), half_life_data, alpha=0.7, color='purple')
     ax4.set_ylabel('Half-life (windows)')
     ax4.set_xlabel('Window')
     ax4.set_title('Victim In-degree Share Half-life')
     ax4.grid(True, alpha=0.3)
     
-    # Format x-axis
-    if 't_start' in metrics_df.columns:
-        for ax in [ax1, ax2, ax3]:
-            ax.xaxis.set_major_formatter(mdates.DateFormatter('%Y-%m-%d'))
-            ax.xaxis.set_major_locator(mdates.DayLocator(interval=1))
-            plt.setp(ax.xaxis.get_majorticklabels(), rotation=45)
+    # Format x-axis; the time axes share x, so one formatter/locator pair
+    # serves them all
+    if _is_time_axis(x):
+        ax1.xaxis.set_major_formatter(mdates.DateFormatter('%Y-%m-%d'))
+        ax1.xaxis.set_major_locator(mdates.DayLocator(interval=1))
+        for ax in [ax2, ax3]:
+            setp(ax.xaxis.get_majorticklabels(), rotation=45)
     
-    plt.tight_layout()
-    plt.savefig(output_path, dpi=300, bbox_inches='tight')
-    plt.close()
+    _save_figure(fig, output_path, dpi)
     
     logger.info(f"Residual panel plot saved to {output_path}")
 
@@ -448,32 +653,62 @@ def create_all_plots(
     metrics_df: pd.DataFrame,
     output_dir: str,
     skeptic_col: Optional[str] = None,
-    friendly_col: Optional[str] = None
+    friendly_col: Optional[str] = None,
+    n_jobs: Optional[int] = None,
+    dpi: int = 300
 ) -> None:
     """
     Create all plots and save to output directory.
     
+    The plots are independent, so they are rendered in separate processes.
+    
     Args:
         metrics_df: DataFrame with metrics over time
         output_dir: Directory to save plots
         skeptic_col: Name of skeptic column
         friendly_col: Name of friendly column
+        n_jobs: Number of worker processes (if None, one per plot up to the
+            CPU count; 1 renders sequentially in this process)
+        dpi: Output resolution (e.g. 150 for quick-look plots)
     """
     os.makedirs(output_dir, exist_ok=True)
     
-    # Create all plots
-    create_burst_series_plot(metrics_df, os.path.join(output_dir, 'burst_series.png'))
-    create_topk_centralization_plot(metrics_df, os.path.join(output_dir, 'topk_centralization.png'))
-    create_nmi_series_plot(metrics_df, os.path.join(output_dir, 'nmi_series.png'))
-    create_isolation_victim_plot(metrics_df, os.path.join(output_dir, 'isolation_victim.png'))
+    metrics_df = _column_major(metrics_df)
+    
+    # Parse window times once for every time-series plot
+    x = _time_axis(metrics_df)
+    
+    # (plot function, output file, extra positional args, keyword args)
+    tasks = [
+        (create_burst_series_plot, 'burst_series.png', (), {'x': x, 'dpi': dpi}),
+        (create_topk_centralization_plot, 'topk_centralization.png', (), {'x': x, 'dpi': dpi}),
+        (create_nmi_series_plot, 'nmi_series.png', (), {'x': x, 'dpi': dpi}),
+        (create_isolation_victim_plot, 'isolation_victim.png', (), {'x': x, 'dpi': dpi}),
+    ]
     
     if skeptic_col:
-        create_dose_response_skeptics_plot(metrics_df, os.path.join(output_dir, 'dose_response_skeptics.png'), skeptic_col)
+        tasks.append((create_dose_response_skeptics_plot, 'dose_response_skeptics.png', (skeptic_col,), {'dpi': dpi}))
     
     if friendly_col:
-        create_dose_response_friendly_plot(metrics_df, os.path.join(output_dir, 'dose_response_friendly.png'), friendly_col)
+        tasks.append((create_dose_response_friendly_plot, 'dose_response_friendly.png', (friendly_col,), {'dpi': dpi}))
+    
+    tasks.append((create_residual_panel_plot, 'residual_panel.png', (), {'x': x, 'dpi': dpi}))
+    
+    if n_jobs is None:
+        n_jobs = min(len(tasks), os.cpu_count() or 1)
     
-    create_residual_panel_plot(metrics_df, os.path.join(output_dir, 'residual_panel.png'))
+    if n_jobs <= 1:
+        for func, filename, args, kwargs in tasks:
+            func(metrics_df, os.path.join(output_dir, filename), *args, **kwargs)
+    else:
+        with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+            futures = [
+                executor.submit(func, metrics_df, os.path.join(output_dir, filename), *args, **kwargs)
+                for func, filename, args, kwargs in tasks
+            ]
+            # Re-raise any worker error here
+            for future in futures:
+                future.result()
     
     logger.info(f"All plots saved to {output_dir}")
 
@@ -481,7 +716,9 @@ def create_all_plots(
 def create_summary_plot(
     metrics_df: pd.DataFrame,
     output_path: str,
-    figsize: Tuple[int, int] = (16, 12)
+    figsize: Tuple[int, int] = (16, 12),
+    x: Optional[np.ndarray] = None,
+    dpi: int = 300
 ) -> None:
     """
     Create a comprehensive summary plot.
@@ -490,14 +727,18 @@ def create_summary_plot(
         metrics_df: DataFrame with metrics over time
         output_path: Path to save the plot
         figsize: Figure size
+        x: Precomputed x values (see _time_axis)
+        dpi: Output resolution
     """
-    fig, axes = plt.subplots(3, 3, figsize=figsize)
+    _lazy_mpl()
+    
+    cols = frozenset(metrics_df.columns)
+    
+    fig, axes = _new_figure(figsize, 3, 3, sharex=True)
     axes = axes.flatten()
     
-    if 't_start' in metrics_df.columns:
-        x = pd.to_datetime(metrics_df['t_start'])
-    else:
-        x = range(len(metrics_df))
+    if x is None:
+        x = _time_axis(metrics_df)
     
     # Plot key metrics
     metrics_to_plot = [
@@ -513,23 +754,23 @@ def create_summary_plot(
     ]
     
     for i, (metric, title) in enumerate(metrics_to_plot):
-        if i < len(axes) and metric in metrics_df.columns:
-            axes[i].plot(x, metrics_df[metric], linewidth=2)
+        if i < len(axes) and metric in cols:
+            axes[i].plot(x, metrics_df[metric].to_numpy(), linewidth=2, rasterized=True)
             axes[i].set_title(title)
             axes[i].grid(True, alpha=0.3)
-            
-            # Format x-axis
-            if 't_start' in metrics_df.columns:
-                axes[i].xaxis.set_major_formatter(mdates.DateFormatter('%Y-%m-%d'))
-                axes[i].xaxis.set_major_locator(mdates.DayLocator(interval=1))
-                plt.setp(axes[i].xaxis.get_majorticklabels(), rotation=45)
     
     # Hide unused subplots
     for i in range(len(metrics_to_plot), len(axes)):
         axes[i].set_visible(False)
     
-    plt.tight_layout()
-    plt.savefig(output_path, dpi=300, bbox_inches='tight')
-    plt.close()
+    # Format x-axis; the axes share x, so one formatter/locator pair serves
+    # them all, and only the bottom row shows tick labels
+    if _is_time_axis(x):
+        axes[0].xaxis.set_major_formatter(mdates.DateFormatter('%Y-%m-%d'))
+        axes[0].xaxis.set_major_locator(mdates.DayLocator(interval=1))
+        for ax in axes[6:9]:
+            setp(ax.xaxis.get_majorticklabels(), rotation=45)
+    
+    _save_figure(fig, output_path, dpi)
     
     logger.info(f"Summary plot saved to {output_path}")
@@ -16,22 +16,25 @@ from ..burst import (
     detect_anomalies,
     calculate_burst_evolution
 )
+from ..metrics_core import calculate_half_life, calculate_half_life_batch
 
 
 class TestBurstDetection(unittest.TestCase):
     """Test burst detection functions."""
     
-    def setUp(self):
-        """Set up test data."""
-        # Create synthetic time series with known burst
-        dates = pd.date_range('2023-01-01', periods=100, freq='H')
-        values = np.random.normal(10, 2, 100)
+    @classmethod
+    def setUpClass(cls):
+        """Set up test data once, with a fixed seed."""
+        # Create synthetic series with known burst; the burst functions only
+        # need positions, so a plain RangeIndex stands in for timestamps
+        rng = np.random.default_rng(42)
+        values = rng.normal(10, 2, 100)
         
         # Add burst period
         values[30:40] += 20  # Strong burst
         values[60:65] += 10  # Weaker burst
         
-        self.ts = pd.Series(values, index=dates)
+        cls.ts = pd.Series(values)
     
     def test_detect_burst(self):
         """Test burst detection."""
@@ -108,8 +111,7 @@ class TestBurstDetection(unittest.TestCase):
         self.assertIsInstance(anomalies, list)
         
         # All anomalies should be valid indices
-        for anomaly in anomalies:
-            self.assertIn(anomaly, self.ts.index)
+        self.assertTrue(pd.Index(anomalies).isin(self.ts.index).all())
     
     def test_calculate_burst_evolution(self):
         """Test burst evolution calculation."""
@@ -154,5 +156,32 @@ class TestBurstEdgeCases(unittest.TestCase):
         self.assertEqual(metrics['peak_median'], 10.0)
 
 
+
+class TestHalfLife(unittest.TestCase):
+    """Test half-life of a metric after its peak."""
+    
+    def test_batch_matches_single(self):
+        """Test the batched half-life against calculate_half_life row by row."""
+        values = np.array([
+            [1.0, 4.0, 9.0, 6.0, 3.0, 2.0],  # Decays after the peak
+            [0.0, 8.0, 7.0, 6.0, 5.0, 4.5],  # Never reaches half
+            [2.0, 2.0, 5.0, 2.0, 1.0, 0.0],  # Reaches half on the next step
+            [1.0, 2.0, 3.0, 4.0, 5.0, 9.0],  # Peak at the last column
+        ])
+        peak_idx = values.argmax(axis=1)
+        
+        for baseline in (None, np.array([0.0, 1.0, 0.5, 2.0])):
+            batch = calculate_half_life_batch(values, peak_idx, baseline)
+            for row, expected in enumerate(batch):
+                single = calculate_half_life(
+                    pd.Series(values[row]), int(peak_idx[row]),
+                    None if baseline is None else baseline[row]
+                )
+                self.assertEqual(expected, -1 if single is None else single)
+        
+        batch = calculate_half_life_batch(values, peak_idx)
+        self.assertEqual(batch.tolist(), [2, -1, 1, -1])
+
+
 if __name__ == '__main__':
     unittest.main()
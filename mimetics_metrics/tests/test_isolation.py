@@ -187,16 +187,39 @@ class TestTimeToIsolation(unittest.TestCase):
         self.assertIsNone(time_to_isolation)
     
     def test_min_windows_requirement(self):
-        """Test minimum windows requirement for isolation."""
+        """Test minimum consecutive windows requirement for isolation."""
+        # Windows 2 and 3 form a run of 2 consecutive isolated windows
         time_to_isolation = calculate_time_to_isolation(
             self.metrics_df,
             ego_density_threshold=0.05,
-            min_windows=2  # Require 2 consecutive isolated windows
+            min_windows=2
         )
+        self.assertEqual(time_to_isolation, 2)
         
-        # Should return None (only 1 isolated window)
+        # No run of 3
+        time_to_isolation = calculate_time_to_isolation(
+            self.metrics_df,
+            ego_density_threshold=0.05,
+            min_windows=3
+        )
         self.assertIsNone(time_to_isolation)
-
+        
+        # Isolated windows that are not consecutive don't count as a run
+        interrupted_df = self.metrics_df.iloc[[2, 0, 3]].reset_index(drop=True)
+        time_to_isolation = calculate_time_to_isolation(
+            interrupted_df,
+            ego_density_threshold=0.05,
+            min_windows=2
+        )
+        self.assertIsNone(time_to_isolation)
+    
+    def test_time_to_isolation_returns_label(self):
+        """Test that the index label is returned for a time index."""
+        index = pd.date_range('2024-01-01', periods=len(self.metrics_df), freq='6h')
+        metrics_df = self.metrics_df.set_index(index)
+        
+        time_to_isolation = calculate_time_to_isolation(metrics_df, min_windows=1)
+        self.assertEqual(time_to_isolation, index[2])
 
 if __name__ == '__main__':
     unittest.main()
@@ -11,7 +11,8 @@ from ..metrics_core import (
     calculate_pagerank,
     calculate_betweenness_centrality,
     calculate_betweenness_centralization,
-    calculate_topk_share
+    calculate_topk_share,
+    NUMBA_AVAILABLE
 )
 
 
@@ -144,6 +145,19 @@ class TestBetweennessCentrality(unittest.TestCase):
         # Should have scores for all nodes
         self.assertEqual(len(bc_scores), large_graph.number_of_nodes())
     
+    @unittest.skipUnless(NUMBA_AVAILABLE, "numba not installed")
+    def test_betweenness_numba_matches_networkx(self):
+        """Test the numba backend against NetworkX."""
+        G = nx.gnp_random_graph(30, 0.1, directed=True, seed=42)
+        for graph in (G, G.to_undirected()):
+            for normalized in (True, False):
+                expected = nx.betweenness_centrality(graph, normalized=normalized)
+                bc_scores = calculate_betweenness_centrality(
+                    graph, normalized=normalized, backend="numba"
+                )
+                for node, score in expected.items():
+                    self.assertAlmostEqual(bc_scores[node], score, places=10)
+    
     def test_betweenness_empty_graph(self):
         """Test betweenness centrality on empty graph."""
         empty_graph = nx.DiGraph()
@@ -8,6 +8,12 @@ from typing import List, Tuple, Dict, Any, Optional
 import logging
 from tqdm import tqdm
 
+try:
+    import joblib
+    JOBLIB_AVAILABLE = True
+except ImportError:
+    JOBLIB_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
 
@@ -34,19 +40,23 @@ def create_windows(
     # Parse window and step sizes
     window_delta = pd.Timedelta(window_size)
     step_delta = pd.Timedelta(step_size)
+    if step_delta <= pd.Timedelta(0):
+        raise ValueError(f"step_size must be positive, got {step_size}")
     
     # Get time range
     start_time = df[time_col].min()
     end_time = df[time_col].max()
     
-    # Create windows
-    windows = []
-    current_start = start_time
+    if pd.isna(start_time):
+        logger.info("Created 0 windows")
+        return []
     
-    while current_start + window_delta <= end_time:
-        current_end = current_start + window_delta
-        windows.append((current_start, current_end))
-        current_start += step_delta
+    # Create windows: every start with start + window_size <= end_time, as
+    # integer nanosecond offsets from the first timestamp
+    last_offset = (end_time - start_time - window_delta).value
+    offsets = np.arange(0, last_offset + 1, step_delta.value, dtype=np.int64)
+    starts = start_time + pd.to_timedelta(offsets, unit='ns')
+    windows = list(zip(starts, starts + window_delta))
     
     logger.info(f"Created {len(windows)} windows")
     return windows
@@ -63,7 +73,9 @@ class WindowProcessor:
         src_col: str = "src",
         dst_col: str = "dst",
         time_col: str = "timestamp",
-        case_col: Optional[str] = None
+        case_col: Optional[str] = None,
+        cache_dir: Optional[str] = None,
+        n_jobs: int = 1
     ):
         """
         Initialize window processor.
@@ -74,12 +86,85 @@ class WindowProcessor:
             dst_col: Destination column name
             time_col: Timestamp column name
             case_col: Case ID column name (if processing multiple cases)
+            cache_dir: Directory for an on-disk cache of process_all_windows
+                results, reused across runs on the same data (requires
+                joblib, from the "advanced" extra; None disables caching)
+            n_jobs: Number of threads process_all_windows uses to handle
+                cases in parallel (-1 uses all cores; requires joblib)
         """
-        self.df = df
+        # Sort by time once so each window is a contiguous row range found by
+        # binary search (rows without a timestamp sort last and are never in
+        # a window)
+        self.df = df.sort_values(time_col, kind="mergesort").reset_index(drop=True)
         self.src_col = src_col
         self.dst_col = dst_col
         self.time_col = time_col
         self.case_col = case_col
+        self.n_jobs = n_jobs
+        
+        # Integer node codes shared by the source and destination columns
+        n_rows = len(self.df)
+        codes, uniques = pd.factorize(
+            pd.concat([self.df[src_col], self.df[dst_col]], ignore_index=True),
+            use_na_sentinel=False
+        )
+        self._src_codes = codes[:n_rows]
+        self._dst_codes = codes[n_rows:]
+        self._n_node_ids = len(uniques)
+        
+        times = self.df[time_col]
+        self._n_timed = int(times.notna().sum())
+        self._times = pd.Index(times.iloc[:self._n_timed])
+        
+        # Per-case row positions (ascending, hence time-sorted) and their times
+        self._case_rows = {}
+        if case_col and case_col in self.df.columns:
+            for cid, rows in self.df.groupby(case_col, sort=False).indices.items():
+                rows = rows[rows < self._n_timed]
+                self._case_rows[cid] = (rows, self._times[rows])
+        
+        # Window metadata depends only on the timestamps, node codes and cases,
+        # so a fingerprint of those keys the on-disk cache
+        self._memory = None
+        if cache_dir is not None:
+            if JOBLIB_AVAILABLE:
+                self._memory = joblib.Memory(location=cache_dir, verbose=0)
+                self._cached_process = self._memory.cache(_process_all_windows, ignore=['processor'])
+                self._fingerprint = joblib.hash((
+                    times.to_numpy(), self._src_codes, self._dst_codes,
+                    self.df[case_col].to_numpy() if self._case_rows else None
+                ))
+            else:
+                logger.warning("joblib not available, window results will not be cached")
+        
+        if n_jobs != 1 and not JOBLIB_AVAILABLE:
+            logger.warning("joblib not available, cases will be processed sequentially")
+    
+    def _window_rows(
+        self,
+        t_start: pd.Timestamp,
+        t_end: pd.Timestamp,
+        case_id: Optional[str] = None
+    ):
+        """
+        Locate the rows of a time window in the time-sorted DataFrame.
+        
+        Args:
+            t_start: Window start time
+            t_end: Window end time
+            case_id: Case ID to filter (if processing multiple cases)
+            
+        Returns:
+            A slice of row positions, or an array of positions when filtering
+            by case
+        """
+        if case_id and self.case_col:
+            rows, times = self._case_rows.get(case_id, (np.empty(0, dtype=np.intp), self._times[:0]))
+            lo, hi = times.searchsorted([t_start, t_end], side="left")
+            return rows[lo:hi]
+        
+        lo, hi = self._times.searchsorted([t_start, t_end], side="left")
+        return slice(lo, hi)
         
     def get_window_data(
         self,
@@ -96,19 +181,10 @@ class WindowProcessor:
             case_id: Case ID to filter (if processing multiple cases)
             
         Returns:
-            DataFrame with interactions in the window
+            DataFrame with interactions in the window, in time order (a slice
+            of self.df; copy it before modifying)
         """
-        # Filter by time window
-        window_df = self.df[
-            (self.df[self.time_col] >= t_start) & 
-            (self.df[self.time_col] < t_end)
-        ].copy()
-        
-        # Filter by case if specified
-        if case_id and self.case_col:
-            window_df = window_df[window_df[self.case_col] == case_id]
-        
-        return window_df
+        return self.df.iloc[self._window_rows(t_start, t_end, case_id)]
     
     def get_window_metadata(
         self,
@@ -127,23 +203,23 @@ class WindowProcessor:
         Returns:
             Dictionary with window metadata
         """
-        window_df = self.get_window_data(t_start, t_end, case_id)
-        
-        if len(window_df) == 0:
-            return {
-                't_start': t_start,
-                't_end': t_end,
-                'n_nodes': 0,
-                'n_edges': 0,
-                'density': 0.0,
-                'case_id': case_id
-            }
+        rows = self._window_rows(t_start, t_end, case_id)
         
         # Get unique nodes
-        all_nodes = set(window_df[self.src_col].unique()) | set(window_df[self.dst_col].unique())
-        n_nodes = len(all_nodes)
-        n_edges = len(window_df)
+        n_nodes = len(np.unique(np.concatenate([self._src_codes[rows], self._dst_codes[rows]])))
+        n_edges = len(self._src_codes[rows])
         
+        return self._metadata(t_start, t_end, n_nodes, n_edges, case_id)
+    
+    @staticmethod
+    def _metadata(
+        t_start: pd.Timestamp,
+        t_end: pd.Timestamp,
+        n_nodes: int,
+        n_edges: int,
+        case_id: Optional[str]
+    ) -> Dict[str, Any]:
+        """Build a window metadata record from its node and edge counts."""
         # Calculate density (for directed graph)
         max_edges = n_nodes * (n_nodes - 1) if n_nodes > 1 else 0
         density = n_edges / max_edges if max_edges > 0 else 0.0
@@ -175,16 +251,14 @@ class WindowProcessor:
         if case_ids is None:
             case_ids = [None]
         
-        all_metadata = []
-        
-        for case_id in case_ids:
-            logger.info(f"Processing {len(windows)} windows for case: {case_id}")
-            
-            for t_start, t_end in tqdm(windows, desc=f"Case {case_id}"):
-                metadata = self.get_window_metadata(t_start, t_end, case_id)
-                all_metadata.append(metadata)
-        
-        return all_metadata
+        if self._memory is not None:
+            return self._cached_process(self, self._fingerprint, list(windows), list(case_ids))
+        return _process_all_windows(self, None, windows, case_ids)
+    
+    def clear_cache(self) -> None:
+        """Remove every cached result from the cache directory."""
+        if self._memory is not None:
+            self._memory.clear(warn=False)
     
     def get_node_labels(
         self,
@@ -210,33 +284,121 @@ class WindowProcessor:
         if len(window_df) == 0:
             return {}
         
-        # Get all unique nodes
-        all_nodes = set(window_df[self.src_col].unique()) | set(window_df[self.dst_col].unique())
+        src = window_df[self.src_col].to_numpy()
+        dst = window_df[self.dst_col].to_numpy()
+        present_cols = [col for col in label_cols if col in window_df.columns]
         
-        # Get labels for each node
-        node_labels = {}
-        for node in all_nodes:
-            node_labels[node] = {}
-            
-            # Get labels from interactions where node is source or destination
-            node_interactions = window_df[
-                (window_df[self.src_col] == node) | (window_df[self.dst_col] == node)
-            ]
-            
-            for col in label_cols:
-                if col in node_interactions.columns:
-                    # Take the most common label for this node
-                    values = node_interactions[col].dropna()
-                    if len(values) > 0:
-                        node_labels[node][col] = values.mode().iloc[0] if len(values.mode()) > 0 else values.iloc[0]
-                    else:
-                        node_labels[node][col] = None
-                else:
-                    node_labels[node][col] = None
+        # Long form: one row per (node, interaction) for both endpoints; a
+        # self-loop is a single interaction of its node
+        not_loop = src != dst
+        long_df = pd.concat([
+            window_df[present_cols].assign(_node=src),
+            window_df.loc[not_loop, present_cols].assign(_node=dst[not_loop])
+        ], ignore_index=True)
+        
+        # Labels default to None (missing column or no non-null value)
+        node_labels = {node: dict.fromkeys(label_cols) for node in long_df['_node'].unique()}
+        
+        for col in present_cols:
+            # Take the most common label for each node; ties go to the
+            # smallest value, as with Series.mode()
+            counts = long_df.groupby(['_node', col], sort=False).size().reset_index(name='_count')
+            counts = counts.sort_values(col).sort_values('_count', ascending=False, kind='mergesort')
+            top = counts.drop_duplicates('_node')
+            for node, value in zip(top['_node'], top[col]):
+                node_labels[node][col] = value
         
         return node_labels
 
 
+def _process_all_windows(
+    processor: WindowProcessor,
+    fingerprint: Optional[str],
+    windows: List[Tuple[pd.Timestamp, pd.Timestamp]],
+    case_ids: List[Optional[str]]
+) -> List[Dict[str, Any]]:
+    """
+    Batch window metadata for WindowProcessor.process_all_windows.
+    
+    A module-level function so that joblib.Memory can cache it; the cache
+    key is (fingerprint, windows, case_ids) and the processor is ignored.
+    
+    Args:
+        processor: Window processor holding the interaction data
+        fingerprint: Hash of the processor's data (only used as a cache key)
+        windows: List of (start_time, end_time) tuples
+        case_ids: List of case IDs to process (None processes all data)
+        
+    Returns:
+        List of metadata dictionaries
+    """
+    if processor.n_jobs != 1 and len(case_ids) > 1 and JOBLIB_AVAILABLE:
+        # Threads share the sorted data; the NumPy kernels release the GIL
+        per_case = joblib.Parallel(n_jobs=processor.n_jobs, prefer="threads")(
+            joblib.delayed(_case_window_metadata)(processor, windows, case_id)
+            for case_id in case_ids
+        )
+    else:
+        per_case = [
+            _case_window_metadata(processor, windows, case_id)
+            # One bar for the whole batch, redrawn at most once a second and
+            # hidden when stderr is not a terminal
+            for case_id in tqdm(case_ids, desc="Window metadata", mininterval=1.0, smoothing=0, disable=None)
+        ]
+    
+    return [metadata for case_metadata in per_case for metadata in case_metadata]
+
+
+def _case_window_metadata(
+    processor: WindowProcessor,
+    windows: List[Tuple[pd.Timestamp, pd.Timestamp]],
+    case_id: Optional[str]
+) -> List[Dict[str, Any]]:
+    """
+    Metadata of every window for one case, computed in one vectorized pass.
+    
+    Args:
+        processor: Window processor holding the interaction data
+        windows: List of (start_time, end_time) tuples
+        case_id: Case ID to process (None processes all data)
+        
+    Returns:
+        List of metadata dictionaries, one per window
+    """
+    logger.info(f"Processing {len(windows)} windows for case: {case_id}")
+    
+    if case_id and processor.case_col:
+        rows, times = processor._case_rows.get(case_id, (np.empty(0, dtype=np.intp), processor._times[:0]))
+    else:
+        rows, times = None, processor._times
+    
+    # Row range of every window at once
+    n_windows = len(windows)
+    lo = times.searchsorted([t_start for t_start, _ in windows], side="left")
+    hi = times.searchsorted([t_end for _, t_end in windows], side="left")
+    n_edges = hi - lo
+    
+    # Gather the rows of all windows back to back (windows may overlap),
+    # tagged with their window number
+    window_id = np.repeat(np.arange(n_windows), n_edges)
+    pos = np.arange(n_edges.sum()) - np.repeat(np.cumsum(n_edges) - n_edges - lo, n_edges)
+    if rows is not None:
+        pos = rows[pos]
+    
+    # Distinct (window, node) pairs, counted per window
+    n_ids = processor._n_node_ids
+    keys = np.concatenate([
+        window_id * n_ids + processor._src_codes[pos],
+        window_id * n_ids + processor._dst_codes[pos]
+    ])
+    n_nodes = np.bincount(np.unique(keys) // max(n_ids, 1), minlength=n_windows)
+    
+    return [
+        processor._metadata(t_start, t_end, nodes, edges, case_id)
+        for (t_start, t_end), nodes, edges in zip(windows, n_nodes.tolist(), n_edges.tolist())
+    ]
+
+
 def parse_time_string(time_str: str) -> pd.Timedelta:
     """
     Parse time string into pandas Timedelta.
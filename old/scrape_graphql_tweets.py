@@ -1,118 +1,201 @@
-from playwright.sync_api import sync_playwright
-from urllib.parse import quote
+from urllib.parse import quote, urlsplit, parse_qs
 from datetime import datetime
 import json
 import time
 
+import requests
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 QUERY = "Wagner Schwartz lang:pt since:2017-01-01 until:2017-12-31"
-SCROLL_LIMIT = 20
-WAIT_BETWEEN_SCROLLS = 5000  # in ms
+PAGE_LIMIT = 200
+WAIT_BETWEEN_PAGES = 0.2  # in s
+
+# One SearchTimeline request copied from the browser's network tab, saved as
+# {"url": "https://x.com/i/api/graphql/<id>/SearchTimeline?variables=...&features=...",
+#  "authorization": "Bearer ..."}; the query id and feature flags change
+# over time, so they are replayed rather than hard-coded
+REQUEST_TEMPLATE_FILE = "search_timeline_request.json"
+COOKIES_FILE = "twitter_cookies.json"
+
+def loads_json(data):
+    # orjson parses the raw response bytes directly, several times faster
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+def dumps_line(obj):
+    if orjson is not None:
+        return orjson.dumps(obj) + b"\n"
+    return (json.dumps(obj, ensure_ascii=False) + "\n").encode("utf-8")
 
 def build_query_url(query):
     return f"https://twitter.com/search?q={quote(query)}&src=typed_query&f=live"
 
-def extract_tweets_from_response(json_data):
-    tweets = []
+def build_session(cookies_path, authorization):
+    with open(cookies_path, "r") as f:
+        cookies = json.load(f)
+
+    session = requests.Session()
+    for cookie in cookies:
+        session.cookies.set(
+            cookie["name"], cookie["value"],
+            domain=cookie.get("domain"), path=cookie.get("path", "/")
+        )
+
+    csrf_token = next((c["value"] for c in cookies if c["name"] == "ct0"), None)
+    if csrf_token is None:
+        raise ValueError(f"No ct0 cookie in {cookies_path}; log in again to refresh it")
+
+    session.headers.update({
+        "authorization": authorization,
+        "x-csrf-token": csrf_token,
+        "x-twitter-auth-type": "OAuth2Session",
+        "x-twitter-active-user": "yes",
+        "content-type": "application/json",
+    })
+    return session
+
+def load_request_template(path):
+    with open(path, "r") as f:
+        template = json.load(f)
+
+    parts = urlsplit(template["url"])
+    params = parse_qs(parts.query)
+    endpoint = f"{parts.scheme}://{parts.netloc}{parts.path}"
+    variables = json.loads(params["variables"][0])
+    extra_params = {
+        name: values[0] for name, values in params.items() if name != "variables"
+    }
+    return endpoint, variables, extra_params, template["authorization"]
+
+def fetch_page(session, endpoint, variables, extra_params, cursor=None):
+    page_variables = dict(variables)
+    page_variables.pop("cursor", None)
+    if cursor is not None:
+        page_variables["cursor"] = cursor
+
+    params = dict(extra_params)
+    params["variables"] = json.dumps(page_variables, separators=(",", ":"))
+    response = session.get(endpoint, params=params, timeout=30)
+    response.raise_for_status()
+    return loads_json(response.content)
+
+def iter_timeline_entries(json_data):
     instructions = json_data.get("data", {}).get("search_by_raw_query", {}).get("search_timeline", {}).get("timeline", {}).get("instructions", [])
 
     for instruction in instructions:
-        entries = instruction.get("entries", [])
-        for entry in entries:
-            if not entry.get("entry_id", "").startswith("tweet-"):
-                continue
-
-            content = entry.get("content", {}).get("itemContent", {})
-            tweet_result = content.get("tweet_results", {}).get("result", {})
-            if tweet_result.get("__typename") != "Tweet":
-                continue
-
-            legacy = tweet_result.get("legacy", {})
-            user_result = tweet_result.get("core", {}).get("user_results", {}).get("result", {})
-            user_legacy = user_result.get("legacy", {})
-
-            tweet_data = {
-                "id": legacy.get("id_str"),
-                "text": legacy.get("full_text"),
-                "created_at": legacy.get("created_at"),
-                "username": user_legacy.get("screen_name"),
-                "name": user_legacy.get("name"),
-                "url": f"https://twitter.com/{user_legacy.get('screen_name')}/status/{legacy.get('id_str')}",
-                "likes": legacy.get("favorite_count"),
-                "retweets": legacy.get("retweet_count"),
-                "replies": legacy.get("reply_count"),
-                "quotes": legacy.get("quote_count"),
-                "is_quote_status": legacy.get("is_quote_status"),
-                "in_reply_to_status_id": legacy.get("in_reply_to_status_id_str"),
-                "conversation_id": tweet_result.get("rest_id"),
-                "language": legacy.get("lang"),
-                "media": [
-                    media.get("media_url_https")
-                    for media in legacy.get("entities", {}).get("media", [])
-                ] if "media" in legacy.get("entities", {}) else []
-            }
-
-            tweets.append(tweet_data)
+        # TimelineAddEntries carries a list, TimelineReplaceEntry a single entry
+        yield from instruction.get("entries", [])
+        if "entry" in instruction:
+            yield instruction["entry"]
+
+def extract_bottom_cursor(json_data):
+    for entry in iter_timeline_entries(json_data):
+        entry_id = entry.get("entry_id", entry.get("entryId", ""))
+        if entry_id.startswith("cursor-bottom-"):
+            return entry.get("content", {}).get("value")
+    return None
+
+def extract_tweets_from_response(json_data):
+    tweets = []
+    for entry in iter_timeline_entries(json_data):
+        if not entry.get("entry_id", "").startswith("tweet-"):
+            continue
+
+        # Plain subscript chains: a missing level raises once instead of
+        # paying a .get call per level on every entry
+        try:
+            tweet_result = entry["content"]["itemContent"]["tweet_results"]["result"]
+        except (KeyError, TypeError):
+            continue
+        if tweet_result.get("__typename") != "Tweet":
+            continue
+
+        legacy = tweet_result.get("legacy") or {}
+        try:
+            user_legacy = tweet_result["core"]["user_results"]["result"]["legacy"]
+        except (KeyError, TypeError):
+            user_legacy = {}
+        entities = legacy.get("entities") or {}
+        tweet_id = legacy.get("id_str")
+        screen_name = user_legacy.get("screen_name")
+
+        tweet_data = {
+            "id": tweet_id,
+            "text": legacy.get("full_text"),
+            "created_at": legacy.get("created_at"),
+            "username": screen_name,
+            "name": user_legacy.get("name"),
+            "url": f"https://twitter.com/{screen_name}/status/{tweet_id}",
+            "likes": legacy.get("favorite_count"),
+            "retweets": legacy.get("retweet_count"),
+            "replies": legacy.get("reply_count"),
+            "quotes": legacy.get("quote_count"),
+            "is_quote_status": legacy.get("is_quote_status"),
+            "in_reply_to_status_id": legacy.get("in_reply_to_status_id_str"),
+            "conversation_id": tweet_result.get("rest_id"),
+            "language": legacy.get("lang"),
+            "media": [
+                media.get("media_url_https")
+                for media in entities.get("media", [])
+            ]
+        }
+
+        tweets.append(tweet_data)
     return tweets
 
 def main():
-    all_tweets = {}
+    seen_ids = set()
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     query_url = build_query_url(QUERY)
 
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        context = browser.new_context()
-
-        # Load cookies
-        with open("twitter_cookies.json", "r") as f:
-            cookies = json.load(f)
-        context.add_cookies(cookies)
-
-        page = context.new_page()
-
-        def handle_response(response):
-            print(f"[DEBUG] {response.url}")
-            if "SearchTimeline" in response.url and response.status == 200:
-                try:
-                    json_body = response.json()
-                    tweets = extract_tweets_from_response(json_body)
-                    for tweet in tweets:
-                        all_tweets[tweet['id']] = tweet  # dedup by ID
-                except Exception as e:
-                    print(f"[!] Error decoding response: {e}")
-
-        page.on("response", handle_response)
-
-        print(f"[→] Navigating to: {query_url}")
-        page.goto(query_url)
-        page.wait_for_timeout(WAIT_BETWEEN_SCROLLS)
-
-        prev_count = 0
-        for i in range(SCROLL_LIMIT):
-            page.mouse.wheel(0, 3000)
-            page.wait_for_timeout(WAIT_BETWEEN_SCROLLS)
-            current_count = len(all_tweets)
-            print(f"[↓] Scroll {i+1}: {current_count} tweets collected.")
-            if current_count == prev_count:
-                print("[✔] No new tweets loaded. Stopping scroll.")
+    endpoint, variables, extra_params, authorization = load_request_template(REQUEST_TEMPLATE_FILE)
+    variables["rawQuery"] = QUERY
+    session = build_session(COOKIES_FILE, authorization)
+
+    # One JSON line per tweet, written as pages arrive, so memory stays flat
+    # and an interrupted run keeps everything fetched so far
+    output_file = f"tweets_query_{timestamp}.ndjson"
+    print(f"[→] Paginating: {endpoint}")
+    cursor = None
+    seen_cursors = set()
+    with open(output_file, "ab") as out:
+        for i in range(PAGE_LIMIT):
+            try:
+                json_body = fetch_page(session, endpoint, variables, extra_params, cursor)
+            except (requests.RequestException, ValueError) as e:
+                print(f"[!] Error fetching page {i+1}: {e}")
                 break
-            prev_count = current_count
 
-        browser.close()
+            prev_count = len(seen_ids)
+            for tweet in extract_tweets_from_response(json_body):
+                if tweet['id'] in seen_ids:  # dedup by ID
+                    continue
+                seen_ids.add(tweet['id'])
+                out.write(dumps_line(tweet))
+            out.flush()
+            current_count = len(seen_ids)
+            print(f"[↓] Page {i+1}: {current_count} tweets collected.")
+
+            cursor = extract_bottom_cursor(json_body)
+            if current_count == prev_count or cursor is None or cursor in seen_cursors:
+                print("[✔] No new tweets loaded. Stopping pagination.")
+                break
+            seen_cursors.add(cursor)
+            time.sleep(WAIT_BETWEEN_PAGES)
 
-    # Save tweets
-    output_file = f"tweets_query_{timestamp}.json"
-    with open(output_file, "w", encoding="utf-8") as f:
-        json.dump(list(all_tweets.values()), f, indent=2, ensure_ascii=False)
-    print(f"[✔] {len(all_tweets)} tweets saved to {output_file}")
+    print(f"[✔] {len(seen_ids)} tweets saved to {output_file}")
 
     # Save metadata
     metadata = {
         "query": QUERY,
         "timestamp": timestamp,
         "query_url": query_url,
-        "tweet_count": len(all_tweets),
-        "scraper_version": "1.1"
+        "tweet_count": len(seen_ids),
+        "output_file": output_file,
+        "scraper_version": "2.0"
     }
     with open(f"metadata_{timestamp}.json", "w", encoding="utf-8") as f:
         json.dump(metadata, f, indent=2, ensure_ascii=False)
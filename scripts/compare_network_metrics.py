@@ -1,16 +1,29 @@
 #!/usr/bin/env python3
 from __future__ import annotations
 import json, glob, os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from pathlib import Path
 from typing import Dict, List, Tuple
+import numpy as np
 import pandas as pd
+try:
+    import orjson
+except ImportError:
+    orjson = None
+import matplotlib
+matplotlib.use("Agg")  # sem janela: seguro dentro do pool de processos
 import matplotlib.pyplot as plt
 
 ROOT = Path("outputs")
 OUT = Path("outputs/compare")
 
 def load_graph_metrics(p: Path) -> Dict:
-    d = json.load(open(p, encoding="utf-8"))
+    if orjson is not None:
+        d = orjson.loads(Path(p).read_bytes())  # parser em C, bem mais rápido
+    else:
+        with open(p, encoding="utf-8") as f:
+            d = json.load(f)
     # normaliza chaves esperadas
     return {
         "n_nodes": d.get("n_nodes"),
@@ -42,10 +55,15 @@ def compute_top_shares(df: pd.DataFrame, col="in_degree", ks=(1,5,10)) -> Dict[s
     if tot <= 0:
         for k in ks: out[f"top{k}_share_in"] = 0.0
         return out
-    s = df.sort_values(col, ascending=False)[col].cumsum()
+    # Only the largest max(ks) values matter: partial sort (O(N)) to get them,
+    # then one descending cumsum serves every k
+    vals = df[col].to_numpy(dtype=float)
+    vals = vals[~np.isnan(vals)]
+    m = min(max(ks), len(vals))
+    top = np.sort(np.partition(vals, len(vals) - m)[len(vals) - m:])[::-1] if m else vals[:0]
+    cum = np.concatenate([[0.0], np.cumsum(top)])
     for k in ks:
-        topk = df.sort_values(col, ascending=False)[col].head(k).sum()
-        out[f"top{k}_share_in"] = float(topk) / float(tot)
+        out[f"top{k}_share_in"] = float(cum[min(k, m)]) / float(tot)
     return out
 
 def safe_float(x, nd=6):
@@ -54,65 +72,75 @@ def safe_float(x, nd=6):
     except Exception:
         return None
 
-def make_barplot(df: pd.DataFrame, y_col: str, outpath: Path, title: str, ylabel: str):
+def make_barplot(ax, df: pd.DataFrame, y_col: str, outpath: Path, title: str, ylabel: str):
     sub = df[["case", y_col]].dropna().sort_values(y_col, ascending=False)
     if sub.empty:
         print(f"[WARN] Sem dados para {y_col}, pulando gráfico.")
         return
-    plt.figure(figsize=(8,5))
-    bars = plt.bar(sub["case"], sub[y_col])
+    # reaproveita a mesma figura entre gráficos: só limpa os eixos
+    ax.clear()
+    bars = ax.bar(sub["case"], sub[y_col])
     for b,v in zip(bars, sub[y_col]):
-        plt.text(b.get_x()+b.get_width()/2, b.get_height(), f"{v:.3f}", ha="center", va="bottom", fontsize=9)
-    plt.title(title)
-    plt.ylabel(ylabel)
-    plt.xticks(rotation=20, ha="right")
-    plt.tight_layout()
+        ax.text(b.get_x()+b.get_width()/2, b.get_height(), f"{v:.3f}", ha="center", va="bottom", fontsize=9)
+    ax.set_title(title)
+    ax.set_ylabel(ylabel)
+    plt.setp(ax.get_xticklabels(), rotation=20, ha="right")
+    ax.figure.tight_layout()
     outpath.parent.mkdir(parents=True, exist_ok=True)
-    plt.savefig(outpath, dpi=180)
-    plt.close()
+    ax.figure.savefig(outpath, dpi=180)
+
+def process_case(gm: Path, outp: Path, save_tops=True) -> Dict:
+    """Resumo de um caso (e Top-10 em disco); casos são independentes."""
+    case = gm.parts[1]  # outputs/<case>/network/graph_metrics.json
+    gm_data = load_graph_metrics(gm)
+    nm = gm.parent / "node_metrics.csv"
+    ndf = load_node_metrics(nm)
+
+    top_shares = compute_top_shares(ndf, col="in_degree", ks=(1,5,10))
+    n, m = gm_data["n_nodes"], gm_data["n_edges"]
+    avg_in = (m / n) if (n and n>0 and m is not None) else None
+
+    row = {
+        "case": case,
+        "n_nodes": n,
+        "n_edges": m,
+        "avg_in_degree": safe_float(avg_in, nd=6),
+        "density": safe_float(gm_data["density"]),
+        "in_deg_centralization": safe_float(gm_data["in_deg_centralization"], nd=6),
+        "modularity": safe_float(gm_data["modularity"], nd=6),
+        "assort_stance": gm_data["assort_stance"],
+        **{k: safe_float(v, nd=6) if v is not None else None for k,v in top_shares.items()}
+    }
+
+    # salva tops por caso
+    if save_tops and ndf is not None and not ndf.empty:
+        keep = ["node","in_degree","out_degree","pagerank","betweenness","community"]
+        outcase = outp / "top_nodes" / case
+        outcase.mkdir(parents=True, exist_ok=True)
+        # nlargest: seleção parcial em vez de ordenar a tabela inteira
+        ndf.nlargest(10, "in_degree")[keep].to_csv(outcase/"top10_in_degree.csv", index=False)
+        ndf.nlargest(10, "pagerank")[keep].to_csv(outcase/"top10_pagerank.csv", index=False)
+        ndf.nlargest(10, "betweenness")[keep].to_csv(outcase/"top10_betweenness.csv", index=False)
+
+    return row
 
-def main(root="outputs", outdir="outputs/compare", save_tops=True):
+def main(root="outputs", outdir="outputs/compare", save_tops=True, max_workers=None):
     rootp = Path(root)
     outp = Path(outdir)
     outp.mkdir(parents=True, exist_ok=True)
 
-    rows = []
     networks = list(rootp.glob("*/network/graph_metrics.json"))
     if not networks:
         print(f"[ERROR] Nenhum graph_metrics.json em {rootp}/<case>/network/")
         return
 
-    for gm in networks:
-        case = gm.parts[1]  # outputs/<case>/network/graph_metrics.json
-        gm_data = load_graph_metrics(gm)
-        nm = gm.parent / "node_metrics.csv"
-        ndf = load_node_metrics(nm)
-
-        top_shares = compute_top_shares(ndf, col="in_degree", ks=(1,5,10))
-        n, m = gm_data["n_nodes"], gm_data["n_edges"]
-        avg_in = (m / n) if (n and n>0 and m is not None) else None
-
-        row = {
-            "case": case,
-            "n_nodes": n,
-            "n_edges": m,
-            "avg_in_degree": safe_float(avg_in, nd=6),
-            "density": safe_float(gm_data["density"]),
-            "in_deg_centralization": safe_float(gm_data["in_deg_centralization"], nd=6),
-            "modularity": safe_float(gm_data["modularity"], nd=6),
-            "assort_stance": gm_data["assort_stance"],
-            **{k: safe_float(v, nd=6) if v is not None else None for k,v in top_shares.items()}
-        }
-        rows.append(row)
-
-        # salva tops por caso
-        if save_tops and ndf is not None and not ndf.empty:
-            keep = ["node","in_degree","out_degree","pagerank","betweenness","community"]
-            outcase = outp / "top_nodes" / case
-            outcase.mkdir(parents=True, exist_ok=True)
-            ndf.sort_values("in_degree", ascending=False)[keep].head(10).to_csv(outcase/"top10_in_degree.csv", index=False)
-            ndf.sort_values("pagerank",  ascending=False)[keep].head(10).to_csv(outcase/"top10_pagerank.csv", index=False)
-            ndf.sort_values("betweenness",ascending=False)[keep].head(10).to_csv(outcase/"top10_betweenness.csv", index=False)
+    # cada caso é independente: um processo por caso
+    worker = partial(process_case, outp=outp, save_tops=save_tops)
+    if len(networks) > 1 and max_workers != 1:
+        with ProcessPoolExecutor(max_workers=max_workers) as ex:
+            rows = list(ex.map(worker, networks))
+    else:
+        rows = [worker(gm) for gm in networks]
 
     df = pd.DataFrame(rows).sort_values("case")
     csv_path = outp / "network_cases_summary.csv"
@@ -120,15 +148,17 @@ def main(root="outputs", outdir="outputs/compare", save_tops=True):
     print(df.to_string(index=False))
     print(f"[OK] resumo salvo em: {csv_path}")
 
-    # gráficos
-    make_barplot(df, "n_nodes", outp/"compare_n_nodes.png", "Nós por caso", "nós")
-    make_barplot(df, "n_edges", outp/"compare_n_edges.png", "Arestas por caso", "arestas")
-    make_barplot(df, "density", outp/"compare_density.png", "Densidade por caso", "densidade")
-    make_barplot(df, "in_deg_centralization", outp/"compare_in_deg_centralization.png", "Centralização (in-degree)", "índice")
-    make_barplot(df, "modularity", outp/"compare_modularity.png", "Modularidade (Louvain)", "índice")
-    make_barplot(df, "top1_share_in", outp/"compare_top1_share_in.png", "Top-1 share (in-degree)", "fração")
-    make_barplot(df, "top5_share_in", outp/"compare_top5_share_in.png", "Top-5 share (in-degree)", "fração")
-    make_barplot(df, "top10_share_in", outp/"compare_top10_share_in.png", "Top-10 share (in-degree)", "fração")
+    # gráficos (uma única figura, reaproveitada)
+    fig, ax = plt.subplots(figsize=(8,5))
+    make_barplot(ax, df, "n_nodes", outp/"compare_n_nodes.png", "Nós por caso", "nós")
+    make_barplot(ax, df, "n_edges", outp/"compare_n_edges.png", "Arestas por caso", "arestas")
+    make_barplot(ax, df, "density", outp/"compare_density.png", "Densidade por caso", "densidade")
+    make_barplot(ax, df, "in_deg_centralization", outp/"compare_in_deg_centralization.png", "Centralização (in-degree)", "índice")
+    make_barplot(ax, df, "modularity", outp/"compare_modularity.png", "Modularidade (Louvain)", "índice")
+    make_barplot(ax, df, "top1_share_in", outp/"compare_top1_share_in.png", "Top-1 share (in-degree)", "fração")
+    make_barplot(ax, df, "top5_share_in", outp/"compare_top5_share_in.png", "Top-5 share (in-degree)", "fração")
+    make_barplot(ax, df, "top10_share_in", outp/"compare_top10_share_in.png", "Top-10 share (in-degree)", "fração")
+    plt.close(fig)
 
     # relatório markdown
     md = [ "# Comparação de métricas de rede (4 casos)\n" ]
@@ -165,5 +195,6 @@ if __name__ == "__main__":
     ap.add_argument("--root", default="outputs", help="raiz onde estão <caso>/network/")
     ap.add_argument("--outdir", default="outputs/compare", help="onde salvar comparativos")
     ap.add_argument("--no-save-tops", action="store_true", help="não salvar Top-10 por caso")
+    ap.add_argument("--workers", type=int, default=None, help="processos em paralelo (padrão: nº de CPUs)")
     args = ap.parse_args()
-    main(root=args.root, outdir=args.outdir, save_tops=not args.no_save_tops)
+    main(root=args.root, outdir=args.outdir, save_tops=not args.no_save_tops, max_workers=args.workers)
@@ -1,32 +1,77 @@
-import os, csv, argparse, networkx as nx
+import os, csv, argparse
+from datetime import date
+from xml.sax.saxutils import escape
 
 def read_edges_csv(path):
-    with open(path, "r", encoding="utf-8-sig", newline="") as f:
-        r = csv.DictReader(f)
-        cols = [c.strip() for c in (r.fieldnames or [])]
-        norm = {c.lower(): c for c in cols}
-        src = norm.get("source") or norm.get("src") or norm.get("from")
-        tgt = norm.get("target") or norm.get("dst") or norm.get("to")
+    # 1 MiB read buffer; csv.reader yields plain lists, columns looked up by index
+    with open(path, "r", encoding="utf-8-sig", newline="", buffering=1 << 20) as f:
+        r = csv.reader(f)
+        cols = [c.strip() for c in next(r, [])]
+        norm = {c.lower(): i for i, c in enumerate(cols)}
+        src = next((norm[k] for k in ("source", "src", "from") if k in norm), None)
+        tgt = next((norm[k] for k in ("target", "dst", "to") if k in norm), None)
         w   = norm.get("weight")
-        if not src or not tgt:
+        if src is None or tgt is None:
             raise ValueError(f"CSV must have Source/Target columns. Found: {cols}")
         for row in r:
-            u = row[src].strip(); v = row[tgt].strip()
+            if not row: continue
+            u = row[src].strip() if src < len(row) else ""
+            v = row[tgt].strip() if tgt < len(row) else ""
             if not u or not v: continue
             wt = 1.0
-            if w and row.get(w,"").strip()!="":
+            if w is not None and w < len(row) and row[w].strip()!="":
                 try: wt = float(row[w])
                 except: wt = 1.0
             yield u, v, wt
 
+def _attr(s):
+    return '"' + escape(s, {'"': "&quot;"}) + '"'
+
+def write_gexf(succ, nodes, path):
+    # GEXF escrito direto no arquivo, linha a linha, sem montar a árvore XML
+    # inteira em memória como o nx.write_gexf
+    with open(path, "w", encoding="utf-8", buffering=1 << 20) as f:
+        f.write("<?xml version='1.0' encoding='utf-8'?>\n"
+                '<gexf xmlns="http://www.gexf.net/1.2draft" '
+                'xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" '
+                'xsi:schemaLocation="http://www.gexf.net/1.2draft '
+                'http://www.gexf.net/1.2draft/gexf.xsd" version="1.2">\n'
+                f'  <meta lastmodifieddate="{date.today().isoformat()}">\n'
+                "    <creator>csv_to_gexf</creator>\n"
+                "  </meta>\n"
+                '  <graph defaultedgetype="directed" mode="static" name="">\n'
+                "    <nodes>\n")
+        for n in nodes:
+            q = _attr(n)
+            f.write(f"      <node id={q} label={q} />\n")
+        f.write("    </nodes>\n    <edges>\n")
+        i = 0
+        # Arestas na ordem dos nós de origem, como em G.edges()
+        for u in nodes:
+            targets = succ.get(u)
+            if not targets: continue
+            qu = _attr(u)
+            for v, wt in targets.items():
+                f.write(f'      <edge source={qu} target={_attr(v)} id="{i}" weight="{wt!r}" />\n')
+                i += 1
+        f.write("    </edges>\n  </graph>\n</gexf>\n")
+    return i
+
 def convert(csv_path, out_dir):
     os.makedirs(out_dir, exist_ok=True)
-    G = nx.DiGraph()
-    for u,v,w in read_edges_csv(csv_path):
-        G.add_edge(u,v,weight=w)
+    # Mesma semântica do nx.DiGraph: nós na ordem em que aparecem, arestas
+    # agrupadas por origem e pares repetidos ficam com o último peso
+    nodes, succ = {}, {}
+    for u, v, wt in read_edges_csv(csv_path):
+        nodes[u] = None
+        nodes[v] = None
+        targets = succ.get(u)
+        if targets is None:
+            targets = succ[u] = {}
+        targets[v] = wt
     out_path = os.path.join(out_dir,"edges.gexf")
-    nx.write_gexf(G,out_path)
-    print(f"Saved {out_path} (nodes={G.number_of_nodes()}, edges={G.number_of_edges()})")
+    n_edges = write_gexf(succ, nodes, out_path)
+    print(f"Saved {out_path} (nodes={len(nodes)}, edges={n_edges})")
 
 if __name__=="__main__":
     ap=argparse.ArgumentParser()
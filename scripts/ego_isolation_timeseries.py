@@ -12,10 +12,17 @@ Suporta CSV ou JSONL com timestamps e gera gráficos + CSV de saída.
 import argparse
 import os
 from pathlib import Path
+import numpy as np
 import pandas as pd
 import networkx as nx
 import matplotlib.pyplot as plt
 
+try:
+    import igraph as ig
+    IGRAPH_AVAILABLE = True
+except ImportError:
+    IGRAPH_AVAILABLE = False
+
 # ============ Config via CLI ============
 def parse_args():
     p = argparse.ArgumentParser(description="Séries de ego_density e avg_dist_to_victim por janelas deslizantes.")
@@ -98,6 +105,54 @@ def avg_distance_to_victim(G, v):
     
     return sum(lengths.values())/len(lengths)
 
+def build_igraph(src, dst):
+    """
+    Constrói grafo igraph (dirigido, sem arestas repetidas) a partir de arrays.
+    
+    Returns:
+        (igraph.Graph, pd.Index com o ID de cada vértice)
+    """
+    codes, ids = pd.factorize(np.concatenate([np.asarray(src), np.asarray(dst)]))
+    m = len(src)
+    g = ig.Graph(n=len(ids), edges=np.column_stack([codes[:m], codes[m:]]).tolist(), directed=True)
+    # DiGraph do NetworkX não guarda arestas repetidas; laços são mantidos
+    g.simplify(multiple=True, loops=False)
+    return g, pd.Index(ids)
+
+def ego_metrics_igraph(g, ids, v, directed=False):
+    """
+    ego_density e avg_distance_to_victim calculados pelo igraph (C).
+    
+    Mesmos resultados das versões NetworkX, sem copiar o grafo para a
+    versão não-dirigida: vizinhanças e BFS usam mode="all".
+    
+    Returns:
+        (ego_density, avg_dist), ambos None se a vítima não existe
+    """
+    pos = ids.get_indexer([v])[0] if len(ids) else -1
+    if pos < 0:
+        return None, None
+    v_idx = int(pos)
+    
+    # Vizinhos de entrada e saída (inclui a vítima só se houver laço)
+    nbrs = sorted(set(g.neighbors(v_idx, mode="all")))
+    if directed:
+        H = g.induced_subgraph(nbrs)
+        n, m = H.vcount(), H.ecount()
+        ed = 0.0 if n <= 1 else m / (n*(n-1))
+    else:
+        H = g.induced_subgraph([u for u in nbrs if u != v_idx])
+        H.to_undirected(mode="collapse")
+        n, m = H.vcount(), H.ecount()
+        ed = 0.0 if n <= 1 else (2*m) / (n*(n-1))
+    
+    # Distâncias não-dirigidas a partir da vítima (só nós alcançáveis)
+    dists = np.asarray(g.distances(source=[v_idx], mode="all")[0], dtype=float)
+    dists[v_idx] = np.inf
+    reach = dists[np.isfinite(dists)]
+    ad = float(reach.mean()) if len(reach) else None
+    return ed, ad
+
 # ============ Main ============
 def main():
     args = parse_args()
@@ -147,28 +202,35 @@ def main():
     bins = pd.interval_range(start=start, end=end, freq=args.window, closed="left")
     print(f"🔢 Total de janelas: {len(bins)}")
     
-    # Mapeia cada linha a uma janela
-    df["__bin"] = pd.cut(df[args.timecol], bins)
+    # df está ordenado por tempo: cada janela é uma fatia contígua [lo, hi),
+    # achada por busca binária em vez de filtrar o DataFrame inteiro por janela
+    bounds_lo = df[args.timecol].searchsorted(bins.left, side="left")
+    bounds_hi = df[args.timecol].searchsorted(bins.right, side="left")
+    src_arr = df[args.srccol].to_numpy()
+    dst_arr = df[args.dstcol].to_numpy()
     
     # Processa cada janela
     print("\n🔄 Processando janelas...")
     rows = []
     victim_found_count = 0
     
-    for i, iv in enumerate(bins):
-        w = df[df["__bin"] == iv]
+    for i, (iv, lo, hi) in enumerate(zip(bins, bounds_lo, bounds_hi)):
         t = iv.left  # timestamp representativo da janela
         
-        if w.empty:
+        if hi == lo:
             rows.append({"t": t, "ego_density": None, "avg_dist": None, "volume": 0})
             continue
 
-        # Constrói grafo (sempre dirigido inicialmente)
-        G = build_graph(w, args.srccol, args.dstcol, directed=True)
-        
-        # Calcula métricas
-        ed = ego_density(G, args.victim, directed=args.directed)
-        ad = avg_distance_to_victim(G, args.victim)
+        if IGRAPH_AVAILABLE:
+            g, ids = build_igraph(src_arr[lo:hi], dst_arr[lo:hi])
+            ed, ad = ego_metrics_igraph(g, ids, args.victim, directed=args.directed)
+        else:
+            # Constrói grafo (sempre dirigido inicialmente)
+            G = build_graph(df.iloc[lo:hi], args.srccol, args.dstcol, directed=True)
+            
+            # Calcula métricas
+            ed = ego_density(G, args.victim, directed=args.directed)
+            ad = avg_distance_to_victim(G, args.victim)
         
         if ed is not None:
             victim_found_count += 1
@@ -177,7 +239,7 @@ def main():
             "t": t, 
             "ego_density": ed, 
             "avg_dist": ad, 
-            "volume": len(w)
+            "volume": int(hi - lo)
         })
         
         if (i + 1) % 10 == 0:
@@ -191,10 +253,9 @@ def main():
         print(f"   Verifique se o ID da vítima está correto.")
         print(f"   Exemplos de nós no grafo:")
         sample_nodes = set()
-        for iv in bins[:5]:  # Primeiras 5 janelas
-            w = df[df["__bin"] == iv]
-            if not w.empty:
-                G = build_graph(w, args.srccol, args.dstcol, directed=True)
+        for lo, hi in zip(bounds_lo[:5], bounds_hi[:5]):  # Primeiras 5 janelas
+            if hi > lo:
+                G = build_graph(df.iloc[lo:hi], args.srccol, args.dstcol, directed=True)
                 sample_nodes.update(list(G.nodes())[:10])
                 if len(sample_nodes) >= 10:
                     break
@@ -3,6 +3,7 @@
 Ponto de entrada principal para análise de casos de cancelamento no Twitter.
 """
 
+import os
 import sys
 import argparse
 from pathlib import Path
@@ -125,10 +126,16 @@ Exemplos de uso:
             print("RESUMO DOS ARQUIVOS GERADOS:")
             print("="*60)
             
-            # Listar arquivos por tipo
-            png_files = sorted(list(output_dir.rglob("*.png")))
-            csv_files = sorted(list(output_dir.rglob("*.csv")))
-            gexf_files = sorted(list(output_dir.rglob("*.gexf")))
+            # Listar arquivos por tipo (uma única varredura da árvore)
+            buckets = {'.png': [], '.csv': [], '.gexf': []}
+            for root, _, files in os.walk(output_dir):
+                for name in files:
+                    ext = os.path.splitext(name)[1]
+                    if ext in buckets:
+                        buckets[ext].append(Path(root) / name)
+            png_files = sorted(buckets['.png'])
+            csv_files = sorted(buckets['.csv'])
+            gexf_files = sorted(buckets['.gexf'])
             
             print(f"\nFiguras ({len(png_files)} arquivos):")
             for png_file in png_files:
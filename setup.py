@@ -52,6 +52,12 @@ setup(
         "advanced": [
             "leidenalg>=0.9.0",
             "igraph>=0.10.0",
+            "networkit>=10.0",
+            "numba>=0.57.0",
+            "joblib>=1.2.0",
+        ],
+        "gpu": [
+            "nx-cugraph",
         ],
         "dev": [
             "pytest>=7.0.0",
@@ -1,24 +1,47 @@
 import os
 import json
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 folder_path = "../data/raw/karolconka"
-total_items = 0
 
-for filename in os.listdir(folder_path):
-    if filename.endswith(".json"):
-        file_path = os.path.join(folder_path, filename)
-        try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                records = json.load(f)
 
-                # If the file is a list of objects
-                for entry in records:
-                    meta = entry.get("metadata", {})
-                    item_count = meta.get("item_count", meta.get("total_entries_in_response", 0))
-                    total_items += item_count
+def count_items(file_path):
+    """Sum item_count over the records of one file (files are independent)"""
+    try:
+        with open(file_path, "rb") as f:
+            raw = f.read()
+        # orjson parses the raw bytes directly, several times faster
+        records = orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+        total = 0
+        # If the file is a list of objects
+        for entry in records:
+            meta = entry.get("metadata", {})
+            total += meta.get("item_count", meta.get("total_entries_in_response", 0))
+        return total
+
+    except Exception as e:
+        print(f"Error reading {os.path.basename(file_path)}: {e}")
+        return 0
+
+
+def main():
+    file_paths = [
+        os.path.join(folder_path, filename)
+        for filename in os.listdir(folder_path)
+        if filename.endswith(".json")
+    ]
+
+    with ProcessPoolExecutor() as ex:
+        total_items = sum(ex.map(count_items, file_paths))
 
+    print(f"Total item_count across all files: {total_items}")
 
-        except Exception as e:
-            print(f"Error reading {filename}: {e}")
 
-print(f"Total item_count across all files: {total_items}")
+if __name__ == "__main__":
+    main()
@@ -1,77 +1,357 @@
 import argparse
 import os
 import json
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain
+import numpy as np
 import pandas as pd
 import networkx as nx
 from datetime import datetime
 
+try:
+    import polars as pl
+    POLARS_AVAILABLE = True
+except ImportError:
+    POLARS_AVAILABLE = False
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.csv as pacsv
+    import pyarrow.json as pajson
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    
+    def njit(*args, **kwargs):
+        """Fallback that leaves the function as plain Python"""
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+EVENT_COLUMNS = ['user_id', 'reply_to', 'retweet_of', 'mentions_json']
+
+# Cells per worker task when mention cells are parsed row by row; columns
+# shorter than two chunks (or single-CPU hosts) are parsed in-process
+MENTION_PARSE_CHUNK = 50_000
+
+# A mentions_json cell that is a JSON list of plain strings (no escapes)
+PLAIN_MENTIONS_PATTERN = (
+    r'^[ \t\r\n]*\[[ \t\r\n]*(?:"[^"\\\x00-\x1f]*"[ \t\r\n]*'
+    r'(?:,[ \t\r\n]*"[^"\\\x00-\x1f]*"[ \t\r\n]*)*)?\][ \t\r\n]*$'
+)
+
+def read_events(events_path):
+    """Read only the columns edges are built from, with ids as strings"""
+    if PYARROW_AVAILABLE:
+        # Multi-threaded Arrow reader; Arrow-backed strings take about half
+        # the memory of object columns
+        table = pacsv.read_csv(
+            events_path,
+            convert_options=pacsv.ConvertOptions(
+                include_columns=EVENT_COLUMNS,
+                column_types={col: pa.string() for col in EVENT_COLUMNS},
+                strings_can_be_null=True  # empty cells are missing, as in pd.read_csv
+            )
+        )
+        return table.to_pandas(types_mapper=pd.ArrowDtype)
+    return pd.read_csv(events_path, usecols=EVENT_COLUMNS, dtype=str)
+
+def _parse_mentions(mentions_json):
+    """Parse a mentions_json cell into a list of ids ([] if malformed)"""
+    if ORJSON_AVAILABLE and isinstance(mentions_json, str):
+        try:
+            return list(orjson.loads(mentions_json))
+        except (orjson.JSONDecodeError, TypeError):
+            pass  # json.loads decides (it also accepts NaN and big ints)
+    try:
+        return list(json.loads(mentions_json))
+    except (json.JSONDecodeError, TypeError):
+        return []
+
+def _parse_mentions_chunk(cells):
+    return [_parse_mentions(value) for value in cells]
+
+def _parse_mentions_rows(cells):
+    """Row-by-row mention parsing, spread over processes for long columns"""
+    if len(cells) < 2 * MENTION_PARSE_CHUNK or (os.cpu_count() or 1) < 2:
+        return _parse_mentions_chunk(cells)
+    # json.loads holds the GIL, so only processes parse in parallel
+    chunks = [cells[i:i + MENTION_PARSE_CHUNK] for i in range(0, len(cells), MENTION_PARSE_CHUNK)]
+    with ProcessPoolExecutor() as ex:
+        return list(chain.from_iterable(ex.map(_parse_mentions_chunk, chunks)))
+
+def _parse_mentions_arrow(cells):
+    """Parse mentions_json cells in one Arrow JSON pass
+    
+    Returns (counts, flat ids), or None when any cell is not a JSON list of
+    strings; the caller then parses row by row.
+    """
+    # Wrap each cell as one NDJSON record so the whole column is decoded by
+    # a single multi-threaded C++ read instead of one json.loads per row
+    body = "".join(f'{{"m":{cell}}}\n' for cell in cells).encode("utf-8")
+    try:
+        table = pajson.read_json(
+            pa.py_buffer(body),
+            parse_options=pajson.ParseOptions(
+                explicit_schema=pa.schema([('m', pa.list_(pa.string()))]),
+                unexpected_field_behavior='error'
+            )
+        )
+    except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+        return None
+    if table.num_rows != len(cells):
+        return None
+    mentions = table.column('m').combine_chunks()
+    counts = pc.fill_null(pc.list_value_length(mentions), 0).to_numpy().astype(np.int64)
+    targets = pc.list_flatten(mentions).to_numpy(zero_copy_only=False).astype(object)
+    return counts, targets
+
 def build_edges_from_events(events_df):
     """Build edges from events DataFrame"""
-    edges = []
-    
-    for _, row in events_df.iterrows():
-        user_id = row['user_id']
-        if pd.isna(user_id):
-            continue
-            
-        # Reply edges: user_id -> author of replied tweet
-        if pd.notna(row['reply_to']):
-            edges.append({
-                'source': user_id,
-                'target': row['reply_to'],
-                'weight': 1,
-                'type': 'reply'
-            })
-        
-        # Retweet edges: user_id -> author of original tweet
-        if pd.notna(row['retweet_of']):
-            edges.append({
-                'source': user_id,
-                'target': row['retweet_of'],
-                'weight': 1,
-                'type': 'retweet'
-            })
-        
-        # Mention edges: user_id -> mentioned user
-        if pd.notna(row['mentions_json']):
-            try:
-                mentions = json.loads(row['mentions_json'])
-                for mention_id in mentions:
-                    if mention_id and mention_id != user_id:  # Don't self-mention
-                        edges.append({
-                            'source': user_id,
-                            'target': mention_id,
-                            'weight': 1,
-                            'type': 'mention'
-                        })
-            except (json.JSONDecodeError, TypeError):
-                pass
-    
-    return pd.DataFrame(edges)
+    events_df = events_df[events_df['user_id'].notna()]
+    user_ids = events_df['user_id'].to_numpy()
+    rows = np.arange(len(events_df))
+    parts = []
+    
+    # Reply edges: user_id -> author of replied tweet
+    # Retweet edges: user_id -> author of original tweet
+    for order, (col, edge_type) in enumerate([('reply_to', 'reply'), ('retweet_of', 'retweet')]):
+        mask = events_df[col].notna().to_numpy()
+        parts.append(pd.DataFrame({
+            'source': user_ids[mask],
+            'target': events_df[col].to_numpy()[mask],
+            'type': edge_type,
+            'row': rows[mask],
+            'order': order
+        }))
+    
+    # Mention edges: user_id -> mentioned user
+    mask = events_df['mentions_json'].notna().to_numpy()
+    cells = events_df['mentions_json'].to_numpy()[mask]
+    parsed = _parse_mentions_arrow(cells) if PYARROW_AVAILABLE and len(cells) else None
+    if parsed is None:
+        mentions = _parse_mentions_rows(cells)
+        counts = np.fromiter(map(len, mentions), dtype=np.int64, count=len(mentions))
+        target = np.fromiter(chain.from_iterable(mentions), dtype=object, count=int(counts.sum()))
+    else:
+        counts, target = parsed
+    source = np.repeat(user_ids[mask], counts)
+    keep = np.fromiter(
+        (bool(mention_id) and mention_id != user_id for mention_id, user_id in zip(target, source)),
+        dtype=bool, count=len(target)
+    )  # Don't self-mention
+    parts.append(pd.DataFrame({
+        'source': source[keep],
+        'target': target[keep],
+        'type': 'mention',
+        'row': np.repeat(rows[mask], counts)[keep],
+        'order': 2
+    }))
+    
+    # Restore the per-event order: reply, retweet, then mentions of each row
+    edges = pd.concat(parts, ignore_index=True)
+    edges = edges.iloc[np.lexsort((edges['order'].to_numpy(), edges['row'].to_numpy()))]
+    
+    # One shared id dictionary for both endpoints: grouping and comparisons
+    # then work on integer codes, and ids are decoded only on output
+    n_edges = len(edges)
+    codes, ids = pd.factorize(
+        np.concatenate([edges['source'].to_numpy(), edges['target'].to_numpy()])
+    )
+    
+    return pd.DataFrame({
+        'source': pd.Categorical.from_codes(codes[:n_edges], categories=ids),
+        'target': pd.Categorical.from_codes(codes[n_edges:], categories=ids),
+        'weight': 1,
+        'type': pd.Categorical(edges['type'].to_numpy(), categories=['reply', 'retweet', 'mention'])
+    })
 
 def aggregate_edges(edges_df):
     """Aggregate edges by source, target, and type"""
     if edges_df.empty:
         return edges_df
     
-    # Group by source, target, and type, sum weights
-    aggregated = edges_df.groupby(['source', 'target', 'type'], as_index=False)['weight'].sum()
+    # Group on categorical codes (build_edges_from_events already encodes
+    # the ids and types; other inputs are encoded here)
+    edges_df = edges_df.astype({'source': 'category', 'target': 'category', 'type': 'category'})
+    
+    # Group by source, target, and type, sum weights (groups in order of first
+    # appearance; the output is written as-is, so sorting keys is wasted)
+    aggregated = edges_df.groupby(
+        ['source', 'target', 'type'], as_index=False, sort=False, observed=True
+    )['weight'].sum()
+    # Edge types that never occur would still show up in value_counts
+    aggregated['type'] = aggregated['type'].cat.remove_unused_categories()
     
     return aggregated
 
+def _parse_mention_ids(mentions_json):
+    """Parse a mentions_json cell into non-empty string ids (for Polars)"""
+    return [str(mention_id) for mention_id in _parse_mentions(mentions_json) if mention_id]
+
+def build_edges_polars(events_path):
+    """Build a lazy Polars edge frame straight from the events CSV"""
+    # Ids are read as strings so every edge column has a single type
+    events = (
+        pl.scan_csv(events_path, schema_overrides={col: pl.String for col in EVENT_COLUMNS})
+        .select(EVENT_COLUMNS)
+        .with_row_index('row')
+        .filter(pl.col('user_id').is_not_null())
+    )
+    
+    parts = [
+        events.filter(pl.col(col).is_not_null()).select(
+            pl.col('user_id').alias('source'),
+            pl.col(col).alias('target'),
+            pl.lit(1, dtype=pl.Int64).alias('weight'),
+            pl.lit(edge_type).alias('type'),
+            'row',
+            pl.lit(order, dtype=pl.Int8).alias('order')
+        )
+        for order, (col, edge_type) in enumerate([('reply_to', 'reply'), ('retweet_of', 'retweet')])
+    ]
+    
+    # Mentions are parsed with the same rules as the pandas path (malformed
+    # cells give no edges), then exploded to one row per mentioned id. Cells
+    # that are plain lists of strings are decoded natively; only the rest
+    # go through the Python parser
+    mentions = events.filter(pl.col('mentions_json').is_not_null())
+    is_plain = pl.col('mentions_json').str.contains(PLAIN_MENTIONS_PATTERN)
+    parts.append(
+        pl.concat([
+            mentions.filter(is_plain).select(
+                'row',
+                pl.col('user_id').alias('source'),
+                pl.col('mentions_json').str.json_decode(pl.List(pl.String)).alias('target')
+            ),
+            mentions.filter(~is_plain).select(
+                'row',
+                pl.col('user_id').alias('source'),
+                pl.col('mentions_json')
+                .map_elements(_parse_mention_ids, return_dtype=pl.List(pl.String))
+                .alias('target')
+            )
+        ])
+        .explode('target')
+        .filter(
+            pl.col('target').is_not_null() & (pl.col('target') != '')
+            & (pl.col('target') != pl.col('source'))  # Don't self-mention
+        )
+        .select(
+            'source', 'target',
+            pl.lit(1, dtype=pl.Int64).alias('weight'),
+            pl.lit('mention').alias('type'),
+            'row',
+            pl.lit(2, dtype=pl.Int8).alias('order')
+        )
+    )
+    
+    # Per-event order as in the pandas path: reply, retweet, then mentions
+    return (
+        pl.concat(parts)
+        .sort(['row', 'order'], maintain_order=True)
+        .drop(['row', 'order'])
+    )
+
+def aggregate_edges_polars(edges):
+    """Aggregate a lazy Polars edge frame into a pandas DataFrame"""
+    aggregated = (
+        # maintain_order keeps first-appearance order, as the pandas path does
+        edges.group_by(['source', 'target', 'type'], maintain_order=True)
+        .agg(pl.col('weight').sum())
+        .select(['source', 'target', 'type', 'weight'])
+        .collect()
+    )
+    # Plain dict round-trip: no pyarrow needed at the NetworkX boundary
+    return pd.DataFrame(aggregated.to_dict(as_series=False))
+
 def build_networkx_graph(edges_df):
     """Build NetworkX directed graph from edges DataFrame"""
-    G = nx.DiGraph()
-    
-    for _, row in edges_df.iterrows():
-        G.add_edge(
-            row['source'],
-            row['target'],
-            weight=row['weight'],
-            type=row['type']
-        )
+    return nx.from_pandas_edgelist(
+        edges_df,
+        source='source',
+        target='target',
+        edge_attr=['weight', 'type'],
+        create_using=nx.DiGraph()
+    )
+
+def _needs_quoting(table):
+    """Whether any string cell holds a CSV delimiter, quote or newline"""
+    special = '[,"\r\n]'
+    for column in table.columns:
+        for chunk in column.chunks:
+            if pa.types.is_dictionary(chunk.type):
+                chunk = chunk.dictionary
+            if (pa.types.is_string(chunk.type) or pa.types.is_large_string(chunk.type)) \
+                    and pc.any(pc.match_substring_regex(chunk, special)).as_py():
+                return True
+    return False
+
+def write_edges(edges_df, path):
+    """Write the edge list as CSV, with Arrow's C++ writer when installed"""
+    if PYARROW_AVAILABLE:
+        try:
+            table = pa.Table.from_pandas(edges_df, preserve_index=False)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            table = None  # mixed-type object columns: let pandas format them
+        if table is not None:
+            # Arrow quotes every string unless told not to; leave them bare,
+            # as pandas does, whenever no cell needs quotes
+            quoting = "needed" if _needs_quoting(table) else "none"
+            with open(path, "w", encoding="utf-8", newline="") as f:
+                # Arrow always quotes the header, so pandas writes it
+                edges_df.iloc[:0].to_csv(f, index=False)
+            with open(path, "ab") as f:
+                pacsv.write_csv(table, f, write_options=pacsv.WriteOptions(
+                    include_header=False, quoting_style=quoting
+                ))
+            return
+    edges_df.to_csv(path, index=False)
+
+@njit(cache=True)
+def _degree_hist_numba(src_codes, dst_codes, n):
+    # Serial on purpose: a prange over edges would race on the shared counters
+    indeg = np.zeros(n, np.int64)
+    outdeg = np.zeros(n, np.int64)
+    for i in range(src_codes.size):
+        outdeg[src_codes[i]] += 1
+        indeg[dst_codes[i]] += 1
+    return indeg, outdeg
+
+def degree_hist(src_codes, dst_codes, n):
+    """In- and out-degree per node code from integer edge endpoint arrays"""
+    if NUMBA_AVAILABLE:
+        return _degree_hist_numba(src_codes, dst_codes, n)
+    return (np.bincount(dst_codes, minlength=n).astype(np.int64),
+            np.bincount(src_codes, minlength=n).astype(np.int64))
+
+def degree_summary(edges_df):
+    """Node count and in/out-degree arrays of the directed graph over edges_df
     
-    return G
+    Parallel edges of different types collapse to one, as in the DiGraph
+    """
+    codes, ids = pd.factorize(
+        np.concatenate([edges_df['source'].to_numpy(), edges_df['target'].to_numpy()])
+    )
+    n = len(ids)
+    pairs = np.unique(codes[:len(edges_df)].astype(np.int64) * n + codes[len(edges_df):])
+    src_codes = (pairs // n).astype(np.int32)
+    dst_codes = (pairs % n).astype(np.int32)
+    indeg, outdeg = degree_hist(src_codes, dst_codes, n)
+    return n, indeg, outdeg
 
 def main():
     parser = argparse.ArgumentParser(description="Build graph from events.csv")
@@ -79,34 +359,58 @@ def main():
     parser.add_argument("--edges", required=True, help="Output edges CSV file")
     parser.add_argument("--gexf", required=True, help="Output GEXF file")
     parser.add_argument("--directed", action="store_true", help="Create directed graph (default: True)")
+    parser.add_argument("--metrics", help="Also compute graph metrics in-process and save them to this CSV "
+                        "(same output as compute_metrics.py, without re-reading the GEXF)")
+    parser.add_argument("--engine", choices=["auto", "pandas", "polars"], default="auto",
+                        help="Edge building engine (auto: polars if installed)")
     
     args = parser.parse_args()
     
-    # Read events
-    print(f"Reading events from: {args.events}")
-    events_df = pd.read_csv(args.events)
-    print(f"Loaded {len(events_df)} events")
-    
-    # Build edges
-    print("Building edges...")
-    edges_df = build_edges_from_events(events_df)
-    print(f"Created {len(edges_df)} edges")
-    
-    if edges_df.empty:
-        print("No edges found!")
-        return
+    use_polars = args.engine == "polars" or (args.engine == "auto" and POLARS_AVAILABLE)
+    if use_polars and not POLARS_AVAILABLE:
+        print("polars not available, falling back to pandas")
+        use_polars = False
     
-    # Aggregate edges
-    print("Aggregating edges...")
-    aggregated_edges = aggregate_edges(edges_df)
+    if use_polars:
+        # Lazy scan, edge building and multi-threaded aggregation in one plan
+        print(f"Building and aggregating edges from: {args.events} (polars)")
+        aggregated_edges = aggregate_edges_polars(build_edges_polars(args.events))
+        print(f"Created {int(aggregated_edges['weight'].sum())} edges")
+        
+        if aggregated_edges.empty:
+            print("No edges found!")
+            return
+    else:
+        # Read events
+        print(f"Reading events from: {args.events}")
+        events_df = read_events(args.events)
+        print(f"Loaded {len(events_df)} events")
+        
+        # Build edges
+        print("Building edges...")
+        edges_df = build_edges_from_events(events_df)
+        print(f"Created {len(edges_df)} edges")
+        
+        if edges_df.empty:
+            print("No edges found!")
+            return
+        
+        # Aggregate edges
+        print("Aggregating edges...")
+        aggregated_edges = aggregate_edges(edges_df)
     print(f"Aggregated to {len(aggregated_edges)} unique edges")
     
+    # Degree counts straight from the edge arrays, without the NetworkX graph
+    n_nodes, indeg, outdeg = degree_summary(aggregated_edges)
+    print(f"Max in-degree: {int(indeg.max())}, max out-degree: {int(outdeg.max())} "
+          f"({n_nodes} nodes)")
+    
     # Create output directory
     os.makedirs(os.path.dirname(args.edges), exist_ok=True)
     os.makedirs(os.path.dirname(args.gexf), exist_ok=True)
     
     # Save edges CSV
-    aggregated_edges.to_csv(args.edges, index=False)
+    write_edges(aggregated_edges, args.edges)
     print(f"Saved edges to: {args.edges}")
     
     # Build NetworkX graph
@@ -114,14 +418,19 @@ def main():
     G = build_networkx_graph(aggregated_edges)
     
     # Add node attributes
-    for node in G.nodes():
-        G.nodes[node]['id'] = node
-        G.nodes[node]['label'] = str(node)
+    nx.set_node_attributes(G, {node: node for node in G.nodes}, 'id')
+    nx.set_node_attributes(G, {node: str(node) for node in G.nodes}, 'label')
     
     # Save GEXF
     nx.write_gexf(G, args.gexf)
     print(f"Saved graph to: {args.gexf}")
     
+    if args.metrics:
+        # Reuse the graph already in memory instead of parsing the GEXF back
+        from compute_metrics import compute_graph_metrics, save_metrics_csv
+        print("Computing metrics...")
+        save_metrics_csv(compute_graph_metrics(G), args.metrics)
+    
     # Print summary
     print(f"\nGraph Summary:")
     print(f"Nodes: {G.number_of_nodes()}")
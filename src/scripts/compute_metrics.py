@@ -2,10 +2,133 @@ import argparse
 import os
 import pandas as pd
 import networkx as nx
+import random
 import numpy as np
+from scipy.sparse.csgraph import shortest_path
 
-def compute_graph_metrics(G):
-    """Compute various graph metrics"""
+try:
+    import igraph as ig
+    IGRAPH_AVAILABLE = True
+except ImportError:
+    IGRAPH_AVAILABLE = False
+
+# Sources per shortest_path call in _path_metrics_csr (bounds the distance
+# block held in memory to PATH_BLOCK_SOURCES x n floats)
+PATH_BLOCK_SOURCES = 256
+
+# Above this many nodes NetworkX betweenness samples BETWEENNESS_SAMPLES
+# sources (Brandes' estimator) instead of running from every node; the
+# top-10 ranking is stable under sampling
+EXACT_BETWEENNESS_MAX_NODES = 2000
+BETWEENNESS_SAMPLES = 500
+
+def _path_metrics_igraph(G_component):
+    """Diameter and average path length of a component with igraph's C BFS"""
+    g = ig.Graph.from_networkx(G_component)
+    # NetworkX raises (reported as None) unless every pair is reachable
+    if g.is_directed() and not g.is_connected(mode="strong"):
+        return None, None
+    return (
+        g.diameter(directed=g.is_directed(), unconn=False),
+        g.average_path_length(directed=g.is_directed(), unconn=False)
+    )
+
+def _path_metrics_csr(G_component):
+    """Diameter and average path length as NetworkX, by BFS over one CSR
+    
+    Distances come from scipy's C shortest_path in blocks of sources, so only
+    the running max and sum are kept rather than the full n x n matrix
+    """
+    A = nx.to_scipy_sparse_array(G_component, weight=None, format='csr')
+    n = A.shape[0]
+    directed = G_component.is_directed()
+    diameter, total = 0, 0.0
+    for start in range(0, n, PATH_BLOCK_SOURCES):
+        dist = shortest_path(
+            A, method='D', directed=directed, unweighted=True,
+            indices=np.arange(start, min(start + PATH_BLOCK_SOURCES, n))
+        )
+        # NetworkX raises (reported as None) unless every pair is reachable
+        if np.isinf(dist).any():
+            return None, None
+        diameter = max(diameter, int(dist.max()))
+        total += dist.sum()
+    return diameter, float(total / (n * (n - 1)))
+
+def _betweenness_igraph(G_undirected):
+    """Normalized betweenness as nx.betweenness_centrality, computed by igraph"""
+    g = ig.Graph.from_networkx(G_undirected)
+    scores = np.asarray(g.betweenness(directed=False), dtype=float)
+    n = g.vcount()
+    if n > 2:
+        # igraph counts unordered pairs; NetworkX normalizes by (n-1)(n-2)/2
+        scores *= 2 / ((n - 1) * (n - 2))
+    return dict(zip(G_undirected.nodes(), scores.tolist()))
+
+def _weighted_igraph(G):
+    """Convert to igraph, returning the weight attribute name (or None)"""
+    g = ig.Graph.from_networkx(G)
+    if 'weight' not in g.es.attributes():
+        return g, None
+    # Edges without a weight count as 1, as in NetworkX
+    g.es['weight'] = [1 if w is None else w for w in g.es['weight']]
+    return g, 'weight'
+
+def _pagerank_igraph(G):
+    """Weighted PageRank as nx.pagerank, computed by igraph (PRPACK)"""
+    g, weights = _weighted_igraph(G)
+    scores = g.pagerank(directed=g.is_directed(), damping=0.85, weights=weights)
+    return dict(zip(G.nodes(), scores))
+
+def _pagerank_csr(A, nodes, alpha=0.85, tol=1.0e-6, max_iter=100):
+    """Weighted PageRank as nx.pagerank, by power iteration on a CSR matrix
+    
+    Same iteration as NetworkX's scipy path, but on a matrix the caller builds
+    once; the dangling mass is a vectorized sum rather than Python's sum()
+    """
+    N = A.shape[0]
+    if N == 0:
+        return {}
+    out_weight = np.asarray(A.sum(axis=1)).ravel()
+    is_dangling = out_weight == 0
+    inv = np.zeros(N)
+    inv[~is_dangling] = 1.0 / out_weight[~is_dangling]
+    # Row-stochastic transition matrix
+    P = A.multiply(inv[:, None]).tocsr()
+    x = np.full(N, 1.0 / N)
+    p = np.full(N, 1.0 / N)
+    for _ in range(max_iter):
+        xlast = x
+        x = alpha * (x @ P + x[is_dangling].sum() * p) + (1 - alpha) * p
+        # Converged in l1 norm
+        if np.abs(x - xlast).sum() < N * tol:
+            return dict(zip(nodes, x.tolist()))
+    raise nx.PowerIterationFailedConvergence(max_iter)
+
+def _louvain_igraph(G_undirected):
+    """Weighted Louvain communities and their modularity, computed by igraph"""
+    g, weights = _weighted_igraph(G_undirected)
+    # igraph draws from Python's random module by default; seed it for
+    # repeatable runs and give the caller's random state back afterwards
+    # (igraph has no getter to save and restore its generator instead)
+    state = random.getstate()
+    random.seed(0)
+    try:
+        clustering = g.community_multilevel(weights=weights)
+    finally:
+        random.setstate(state)
+    return len(clustering), g.modularity(clustering.membership, weights=weights)
+
+def compute_graph_metrics(G, backend="auto"):
+    """Compute various graph metrics
+    
+    backend: "networkx", "igraph" or "auto" (igraph if installed) for the
+    path, clustering, community, PageRank and betweenness metrics
+    """
+    use_igraph = backend in ("auto", "igraph") and IGRAPH_AVAILABLE
+    if backend == "igraph" and not IGRAPH_AVAILABLE:
+        print("igraph not available, falling back to NetworkX")
+    
     metrics = {}
     
     # Basic metrics
@@ -18,38 +141,40 @@ def compute_graph_metrics(G):
     
     # Connected components
     if G.is_directed():
-        metrics['n_weak_components'] = nx.number_weakly_connected_components(G)
+        # One component pass gives both the count and the largest
+        weak_components = list(nx.weakly_connected_components(G))
+        metrics['n_weak_components'] = len(weak_components)
         metrics['n_strong_components'] = nx.number_strongly_connected_components(G)
         
         # Largest weakly connected component
-        largest_wcc = max(nx.weakly_connected_components(G), key=len)
+        largest_wcc = max(weak_components, key=len)
         G_largest_wcc = G.subgraph(largest_wcc)
     else:
-        metrics['n_components'] = nx.number_connected_components(G_undirected)
+        components = list(nx.connected_components(G_undirected))
+        metrics['n_components'] = len(components)
         
         # Largest connected component
-        largest_cc = max(nx.connected_components(G_undirected), key=len)
+        largest_cc = max(components, key=len)
         G_largest_cc = G_undirected.subgraph(largest_cc)
         G_largest_wcc = G_largest_cc
     
     # Metrics on largest component
-    if G_largest_wcc.number_of_nodes() > 1:
-        try:
-            metrics['diameter'] = nx.diameter(G_largest_wcc)
-        except nx.NetworkXError:
-            metrics['diameter'] = None
-        
-        try:
-            metrics['avg_path_length'] = nx.average_shortest_path_length(G_largest_wcc)
-        except nx.NetworkXError:
-            metrics['avg_path_length'] = None
+    if G_largest_wcc.number_of_nodes() > 1 and use_igraph:
+        metrics['diameter'], metrics['avg_path_length'] = _path_metrics_igraph(G_largest_wcc)
+    elif G_largest_wcc.number_of_nodes() > 1:
+        metrics['diameter'], metrics['avg_path_length'] = _path_metrics_csr(G_largest_wcc)
     else:
         metrics['diameter'] = None
         metrics['avg_path_length'] = None
     
     # Clustering coefficient
     try:
-        metrics['avg_clustering'] = nx.average_clustering(G_undirected)
+        if use_igraph:
+            # mode="zero" counts nodes of degree < 2 as 0, as NetworkX does
+            g = ig.Graph.from_networkx(G_undirected)
+            metrics['avg_clustering'] = g.transitivity_avglocal_undirected(mode="zero") if g.vcount() else 0
+        else:
+            metrics['avg_clustering'] = nx.average_clustering(G_undirected)
     except:
         metrics['avg_clustering'] = None
     
@@ -59,16 +184,26 @@ def compute_graph_metrics(G):
     
     # Modularity (if possible)
     try:
-        communities = list(nx.algorithms.community.greedy_modularity_communities(G_undirected))
-        metrics['modularity'] = nx.algorithms.community.quality.modularity(G_undirected, communities)
-        metrics['n_communities'] = len(communities)
+        if use_igraph:
+            metrics['n_communities'], metrics['modularity'] = _louvain_igraph(G_undirected)
+        else:
+            communities = nx.community.louvain_communities(G_undirected, weight='weight', seed=0)
+            metrics['modularity'] = nx.community.modularity(G_undirected, communities, weight='weight')
+            metrics['n_communities'] = len(communities)
     except:
         metrics['modularity'] = None
         metrics['n_communities'] = None
     
     # PageRank (top 10)
     try:
-        pagerank = nx.pagerank(G)
+        if use_igraph:
+            pagerank = _pagerank_igraph(G)
+        elif len(G):
+            nodes = list(G)
+            A = nx.to_scipy_sparse_array(G, nodelist=nodes, weight='weight', dtype=float)
+            pagerank = _pagerank_csr(A, nodes)
+        else:
+            pagerank = {}
         top_pagerank = sorted(pagerank.items(), key=lambda x: x[1], reverse=True)[:10]
         metrics['top_10_pagerank'] = top_pagerank
     except:
@@ -76,7 +211,15 @@ def compute_graph_metrics(G):
     
     # Betweenness centrality (top 10)
     try:
-        betweenness = nx.betweenness_centrality(G_undirected)
+        n = G_undirected.number_of_nodes()
+        if use_igraph:
+            betweenness = _betweenness_igraph(G_undirected)
+        elif n > EXACT_BETWEENNESS_MAX_NODES:
+            betweenness = nx.betweenness_centrality(
+                G_undirected, k=min(BETWEENNESS_SAMPLES, n), seed=0, normalized=True
+            )
+        else:
+            betweenness = nx.betweenness_centrality(G_undirected)
         top_betweenness = sorted(betweenness.items(), key=lambda x: x[1], reverse=True)[:10]
         metrics['top_10_betweenness'] = top_betweenness
     except:
@@ -84,24 +227,23 @@ def compute_graph_metrics(G):
     
     return metrics
 
-def main():
-    parser = argparse.ArgumentParser(description="Compute graph metrics")
-    parser.add_argument("--gexf", required=True, help="Input GEXF file")
-    parser.add_argument("--out", required=True, help="Output CSV file")
-    
-    args = parser.parse_args()
-    
-    # Read graph
-    print(f"Reading graph from: {args.gexf}")
-    G = nx.read_gexf(args.gexf)
-    print(f"Loaded graph with {G.number_of_nodes()} nodes and {G.number_of_edges()} edges")
+def compute_graph_metrics_from_edges(edges_df, backend="auto"):
+    """Compute graph metrics straight from an aggregated edge list
     
-    # Compute metrics
-    print("Computing metrics...")
-    metrics = compute_graph_metrics(G)
-    
-    # Create output directory
-    os.makedirs(os.path.dirname(args.out), exist_ok=True)
+    edges_df has source, target and weight columns (as build_graph writes),
+    so a pipeline can skip the GEXF write/parse round trip
+    """
+    G = nx.from_pandas_edgelist(
+        edges_df, source='source', target='target',
+        edge_attr='weight', create_using=nx.DiGraph()
+    )
+    return compute_graph_metrics(G, backend=backend)
+
+def save_metrics_csv(metrics, out_path):
+    """Write metrics as (metric, value) rows"""
+    out_dir = os.path.dirname(out_path)
+    if out_dir:
+        os.makedirs(out_dir, exist_ok=True)
     
     # Prepare data for CSV
     csv_data = []
@@ -142,8 +284,35 @@ def main():
     
     # Save to CSV
     df = pd.DataFrame(csv_data)
-    df.to_csv(args.out, index=False)
-    print(f"Saved metrics to: {args.out}")
+    df.to_csv(out_path, index=False)
+    print(f"Saved metrics to: {out_path}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Compute graph metrics")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--gexf", help="Input GEXF file")
+    source.add_argument("--edges", help="Input edges CSV (source,target,weight), read without an XML parse")
+    parser.add_argument("--out", required=True, help="Output CSV file")
+    
+    args = parser.parse_args()
+    
+    if args.edges:
+        print(f"Reading edges from: {args.edges}")
+        edges_df = pd.read_csv(args.edges, dtype={'source': str, 'target': str})
+        print(f"Loaded {len(edges_df)} edges")
+        print("Computing metrics...")
+        metrics = compute_graph_metrics_from_edges(edges_df)
+    else:
+        # Read graph
+        print(f"Reading graph from: {args.gexf}")
+        G = nx.read_gexf(args.gexf)
+        print(f"Loaded graph with {G.number_of_nodes()} nodes and {G.number_of_edges()} edges")
+        
+        # Compute metrics
+        print("Computing metrics...")
+        metrics = compute_graph_metrics(G)
+    
+    save_metrics_csv(metrics, args.out)
     
     # Print summary
     print(f"\nGraph Metrics Summary:")
@@ -1,21 +1,131 @@
 import argparse
+import csv
 import os
 import json
 import glob
 import re
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 import pandas as pd
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+def loads_json(data):
+    """Parse JSON bytes (orjson when installed, several times faster)"""
+    return orjson.loads(data) if ORJSON_AVAILABLE else json.loads(data)
+
+def parse_raw_records(raw):
+    """Parse a raw capture into its list of {"metadata", "data"} records
+    
+    The collectors append one record per response followed by ",\n", so the
+    file is a JSON array without its brackets
+    """
+    raw = raw.strip()
+    if raw.startswith(b"["):
+        return loads_json(raw)
+    return loads_json(b"[" + raw.rstrip(b",") + b"]")
+
+def _tweet_legacy(result):
+    """Unwrap a tweet_results.result into (result, legacy), or (None, None)"""
+    if result.get("__typename") == "TweetWithVisibilityResults":
+        result = result.get("tweet") or {}
+    legacy = result.get("legacy")
+    if not legacy:
+        return None, None
+    return result, legacy
+
+def iter_timeline_tweets(record):
+    """Yield the tweet result of every tweet-* timeline entry in a record"""
+    try:
+        instructions = record["data"]["data"]["search_by_raw_query"]["search_timeline"]["timeline"]["instructions"]
+    except (KeyError, TypeError):
+        return
+    for instruction in instructions:
+        for entry in instruction.get("entries", []):
+            if not entry.get("entryId", "").startswith("tweet-"):
+                continue
+            try:
+                yield entry["content"]["itemContent"]["tweet_results"]["result"]
+            except (KeyError, TypeError):
+                continue
+
+def _tweet_row(legacy, tweet_id=None, user_id=None, retweet_of=None):
+    mentions = (legacy.get("entities") or {}).get("user_mentions") or []
+    return {
+        'tweet_id': legacy.get("id_str") or tweet_id,
+        'user_id': legacy.get("user_id_str") or user_id,
+        'created_at': legacy.get("created_at"),
+        'text': legacy.get("full_text"),
+        'reply_to': legacy.get("in_reply_to_status_id_str"),
+        'retweet_of': retweet_of,
+        'mentions': [m["id_str"] for m in mentions if m.get("id_str")]
+    }
+
+def extract_tweet_data_from_records(records):
+    """Extract tweet rows by walking the parsed response structure
+    
+    Handles SearchTimeline captures ({"metadata", "data"}) and the collectors'
+    flat v1.1-style dumps ({"metadata", "tweets"})
+    """
+    tweets = []
+    for record in records:
+        # Flat dumps: user and retweet author sit under nested "user" objects
+        for tweet in record.get("tweets") or []:
+            retweeted = tweet.get("retweeted_status") or {}
+            tweets.append(_tweet_row(
+                tweet,
+                user_id=(tweet.get("user") or {}).get("id_str"),
+                retweet_of=(retweeted.get("user") or {}).get("id_str") or retweeted.get("user_id_str")
+            ))
+        
+        for result in iter_timeline_tweets(record):
+            result, legacy = _tweet_legacy(result)
+            if legacy is None:
+                continue
+            
+            # Retweets: author of the original tweet
+            retweet_of = None
+            retweeted = (legacy.get("retweeted_status_result") or {}).get("result")
+            if retweeted:
+                _, retweeted_legacy = _tweet_legacy(retweeted)
+                if retweeted_legacy:
+                    retweet_of = retweeted_legacy.get("user_id_str")
+            
+            tweets.append(_tweet_row(legacy, tweet_id=result.get("rest_id"), retweet_of=retweet_of))
+    return tweets
+
+# Fallback extractor patterns, compiled once instead of per tweet
+_PATTERNS = {
+    'full_text': re.compile(r'"full_text":\s*"([^"]*)"'),
+    'created_at': re.compile(r'"created_at":\s*"([^"]*)"'),
+    'user_id': re.compile(r'"user_id_str":\s*"([^"]*)"'),
+    'id_str': re.compile(r'"id_str":\s*"([^"]*)"'),
+    'reply_to': re.compile(r'"in_reply_to_status_id_str":\s*"([^"]*)"'),
+    'retweet': re.compile(r'"retweeted_status":\s*\{[^}]*"user":\s*\{[^}]*"id_str":\s*"([^"]*)"'),
+    'mentions': re.compile(r'"user_mentions":\s*\[([^\]]*)\]'),
+}
+
 def extract_tweet_data_from_content(content):
-    """Extract tweet data from file content using regex patterns"""
+    """Extract tweet data from file content using regex patterns
+    
+    Fallback for captures that do not parse as JSON (e.g. cut short mid-write)
+    """
     tweets = []
     
     # Find all full_text occurrences
-    full_text_pattern = r'"full_text":\s*"([^"]*)"'
-    full_text_matches = list(re.finditer(full_text_pattern, content))
+    full_text_matches = list(_PATTERNS['full_text'].finditer(content))
     
     print(f"Found {len(full_text_matches)} full_text occurrences")
     
+    def find(field, window_start, window_end):
+        # pos/endpos bound the search to the window without slicing a copy
+        m = _PATTERNS[field].search(content, window_start, window_end)
+        return m.group(1) if m else None
+    
     for i, match in enumerate(full_text_matches):
         if i % 100 == 0:
             print(f"Processing tweet {i+1}/{len(full_text_matches)}")
@@ -24,32 +134,31 @@ def extract_tweet_data_from_content(content):
             # Get the position of this full_text
             start_pos = match.start()
             
-            # Extract a window around this position to find related fields
+            # Window around this position in which related fields are taken
             window_start = max(0, start_pos - 2000)
             window_end = min(len(content), start_pos + 2000)
-            window = content[window_start:window_end]
             
             # Extract fields from this window
             full_text = match.group(1)
             
             # Extract other fields
-            created_at_match = re.search(r'"created_at":\s*"([^"]*)"', window)
-            user_id_match = re.search(r'"user_id_str":\s*"([^"]*)"', window)
-            tweet_id_match = re.search(r'"id_str":\s*"([^"]*)"', window)
-            reply_to_match = re.search(r'"in_reply_to_status_id_str":\s*"([^"]*)"', window)
+            created_at = find('created_at', window_start, window_end)
+            user_id = find('user_id', window_start, window_end)
+            tweet_id = find('id_str', window_start, window_end)
+            reply_to = find('reply_to', window_start, window_end)
             
             # For retweets, look for retweeted_status structure
-            retweet_match = re.search(r'"retweeted_status":\s*\{[^}]*"user":\s*\{[^}]*"id_str":\s*"([^"]*)"', window)
+            retweet_match = _PATTERNS['retweet'].search(content, window_start, window_end)
             
             # For mentions, look for user_mentions array
-            mentions_match = re.search(r'"user_mentions":\s*\[([^\]]*)\]', window)
+            mentions_match = _PATTERNS['mentions'].search(content, window_start, window_end)
             
             tweet = {
-                'tweet_id': tweet_id_match.group(1) if tweet_id_match else None,
-                'user_id': user_id_match.group(1) if user_id_match else None,
-                'created_at': created_at_match.group(1) if created_at_match else None,
+                'tweet_id': tweet_id,
+                'user_id': user_id,
+                'created_at': created_at,
                 'text': full_text,
-                'reply_to': reply_to_match.group(1) if reply_to_match else None,
+                'reply_to': reply_to,
                 'retweet_of': retweet_match.group(1) if retweet_match else None,
                 'mentions': []
             }
@@ -57,7 +166,7 @@ def extract_tweet_data_from_content(content):
             # Extract mentions
             if mentions_match:
                 mentions_text = mentions_match.group(1)
-                mention_id_matches = re.findall(r'"id_str":\s*"([^"]*)"', mentions_text)
+                mention_id_matches = _PATTERNS['id_str'].findall(mentions_text)
                 tweet['mentions'] = mention_id_matches
             
             tweets.append(tweet)
@@ -71,11 +180,17 @@ def process_twitter_file(file_path):
     """Process a single Twitter JSON file"""
     try:
         print(f"Reading file: {file_path}")
-        with open(file_path, "r", encoding="utf-8") as f:
-            content = f.read()
+        with open(file_path, "rb") as f:
+            raw = f.read()
         
-        print(f"File size: {len(content)} characters")
-        tweets = extract_tweet_data_from_content(content)
+        print(f"File size: {len(raw)} bytes")
+        try:
+            records = parse_raw_records(raw)
+        except ValueError:  # json and orjson decode errors are ValueErrors
+            print("Not valid JSON, falling back to regex extraction")
+            return extract_tweet_data_from_content(raw.decode("utf-8"))
+        tweets = extract_tweet_data_from_records(records)
+        print(f"Parsed {len(records)} responses")
         return tweets
         
     except Exception as e:
@@ -96,42 +211,55 @@ def main():
         print(f"No files found matching pattern: {args.raw}")
         return
     
-    all_tweets = []
+    columns = ['tweet_id', 'user_id', 'created_at', 'text', 'reply_to', 'retweet_of', 'mentions_json']
+    n_written = 0
+    sample = []
+    out = None
     
     print(f"Processing {len(files)} files...")
     
-    for file_path in files:
-        print(f"Processing: {os.path.basename(file_path)}")
-        tweets = process_twitter_file(file_path)
-        all_tweets.extend(tweets)
-        print(f"  Found {len(tweets)} tweets")
+    # Files are independent: parse them in parallel processes (results come
+    # back in file order). Rows are streamed to the CSV as each file arrives
+    # instead of collecting the whole corpus in one DataFrame
+    try:
+        with ProcessPoolExecutor() as ex:
+            for file_path, tweets in zip(files, ex.map(process_twitter_file, files, chunksize=1)):
+                print(f"Processed: {os.path.basename(file_path)}")
+                print(f"  Found {len(tweets)} tweets")
+                if not tweets:
+                    continue
+                
+                if out is None:
+                    # Create output directory if it doesn't exist
+                    os.makedirs(os.path.dirname(args.out), exist_ok=True)
+                    out = open(args.out, "w", encoding="utf-8", newline="", buffering=1 << 20)
+                    writer = csv.writer(out, lineterminator="\n")
+                    writer.writerow(columns)
+                
+                rows = [
+                    (t['tweet_id'], t['user_id'], t['created_at'], t['text'],
+                     t['reply_to'], t['retweet_of'],
+                     json.dumps(t['mentions']) if t['mentions'] else '[]')  # Mentions as JSON string
+                    for t in tweets
+                ]
+                writer.writerows(rows)
+                n_written += len(rows)
+                sample.extend(rows[:5 - len(sample)])
+    finally:
+        if out is not None:
+            out.close()
     
-    if not all_tweets:
+    if not n_written:
         print("No tweets found!")
         return
     
-    # Convert to DataFrame
-    df = pd.DataFrame(all_tweets)
-    
-    # Convert mentions to JSON string
-    df['mentions_json'] = df['mentions'].apply(lambda x: json.dumps(x) if x else '[]')
-    
-    # Select and rename columns
-    events_df = df[['tweet_id', 'user_id', 'created_at', 'text', 'reply_to', 'retweet_of', 'mentions_json']].copy()
-    
-    # Create output directory if it doesn't exist
-    os.makedirs(os.path.dirname(args.out), exist_ok=True)
-    
-    # Save to CSV
-    events_df.to_csv(args.out, index=False, encoding='utf-8')
-    
     print(f"\nResults:")
-    print(f"Total tweets processed: {len(events_df)}")
+    print(f"Total tweets processed: {n_written}")
     print(f"Events saved to: {args.out}")
     
     # Show sample
     print(f"\nSample data:")
-    print(events_df.head())
+    print(pd.DataFrame(sample, columns=columns))
 
 if __name__ == "__main__":
     main()
\ No newline at end of file